@@ -19,6 +19,9 @@ from .exception import AyameError, _Redirect
 
 __all__ = ['Ayame', 'Request']
 
+# marker for unparsed value
+_UNSET = object()
+
 
 class Ayame:
 
@@ -33,14 +36,19 @@ class Ayame:
             'ayame.converter.registry': converter.ConverterRegistry(),
             'ayame.i18n.cache': util.LRUCache(64),
             'ayame.i18n.localizer': i18n.Localizer(),
+            'ayame.markup.buffer_size': 8192,
             'ayame.markup.cache': util.LRUCache(64),
             'ayame.markup.encoding': 'utf-8',
+            'ayame.markup.head.aggregate': False,
             'ayame.markup.loader': markup.MarkupLoader,
             'ayame.markup.pretty': False,
             'ayame.markup.renderer': markup.MarkupRenderer,
             'ayame.markup.separator': '.',
+            'ayame.markup.share_static': False,
+            'ayame.markup.streaming': False,
             'ayame.max.redirect': 7,
             'ayame.page.http': page.HTTPStatusPage,
+            'ayame.render.cache': util.LRUCache(64),
             'ayame.request': Request,
             'ayame.resource.loader': res.ResourceLoader(),
             'ayame.route.map': route.Map(),
@@ -145,25 +153,76 @@ class Ayame:
 
 class Request:
 
-    __slots__ = ('environ', 'method', 'uri', 'query', 'form_data', 'path',
-                 'locale')
+    __slots__ = ('environ', 'method', 'uri', '__query', '__form_data', '__path',
+                 '__locale')
 
     def __init__(self, environ, values):
         self.environ = environ
         self.method = environ['REQUEST_METHOD']
         self.uri = values
-        self.query = uri.parse_qs(environ)
-        self.form_data = http.parse_form_data(environ)
-        # retrieve ayame:path
-        if self.method == 'GET':
-            self.path = self.query.get(core.AYAME_PATH)
-        elif self.method == 'POST':
-            self.path = self.form_data.get(core.AYAME_PATH)
-        else:
-            self.path = None
-        if self.path:
-            self.path = self.path[0]
-        self.locale = self._parse_locales(environ)
+        self.__query = _UNSET
+        self.__form_data = _UNSET
+        self.__path = _UNSET
+        self.__locale = _UNSET
+
+    def query():
+        def fget(self):
+            if self.__query is _UNSET:
+                self.__query = uri.parse_qs(self.environ)
+            return self.__query
+
+        def fset(self, query):
+            self.__query = query
+
+        return locals()
+
+    query = property(**query())
+
+    def form_data():
+        def fget(self):
+            if self.__form_data is _UNSET:
+                self.__form_data = http.parse_form_data(self.environ)
+            return self.__form_data
+
+        def fset(self, form_data):
+            self.__form_data = form_data
+
+        return locals()
+
+    form_data = property(**form_data())
+
+    def path():
+        def fget(self):
+            if self.__path is _UNSET:
+                # retrieve ayame:path
+                if self.method == 'GET':
+                    path = self.query.get(core.AYAME_PATH)
+                elif self.method == 'POST':
+                    path = self.form_data.get(core.AYAME_PATH)
+                else:
+                    path = None
+                self.__path = path[0] if path else path
+            return self.__path
+
+        def fset(self, path):
+            self.__path = path
+
+        return locals()
+
+    path = property(**path())
+
+    def locale():
+        def fget(self):
+            if self.__locale is _UNSET:
+                self.__locale = self._parse_locales(self.environ)
+            return self.__locale
+
+        def fset(self, locale):
+            self.__locale = locale
+
+        return locals()
+
+    locale = property(**locale())
 
     def _parse_locales(self, environ):
         values = http.parse_accept(environ.get('HTTP_ACCEPT_LANGUAGE'))
@@ -193,7 +252,10 @@ class Request:
         self.close()
 
     def close(self):
-        for _, data in self.form_data.items():
+        if (self.__form_data is _UNSET
+            or not self.__form_data):
+            return
+        for _, data in self.__form_data.items():
             for v in data:
                 if isinstance(v, werkzeug.datastructures.FileStorage):
                     v.close()
@@ -6,18 +6,22 @@
 #   SPDX-License-Identifier: MIT
 #
 
+import abc
 import collections.abc
 
 from . import core, markup, uri
 from . import model as mm
 
 
-__all__ = ['Label', 'ListView', 'PropertyListView', 'ContextPathGenerator',
-           'ContextImage', 'ContextLink']
+__all__ = ['Label', 'ListView', 'PropertyListView', 'DataProvider',
+           'ListDataProvider', 'DataView', 'ContextPathGenerator', 'ContextImage',
+           'ContextLink']
 
 
 class Label(core.Component):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None):
         if isinstance(model, str):
             model = mm.Model(model)
@@ -30,6 +34,8 @@ class Label(core.Component):
 
 class ListView(core.MarkupContainer):
 
+    __slots__ = ('_populate_item',)
+
     def __init__(self, id, model=None, populate_item=None):
         if isinstance(model, collections.abc.Sequence):
             model = mm.Model(model)
@@ -46,12 +52,7 @@ class ListView(core.MarkupContainer):
         super().on_before_render()
 
     def on_render(self, element):
-        skel = element.copy()
-        skel.qname = markup.DIV
-        del element[:]
-        for c in self.children:
-            element.extend(c.on_render(skel.copy()))
-        return element
+        return _render_items(self, element)
 
     def populate_item(self, item):
         if callable(self._populate_item):
@@ -64,8 +65,20 @@ class ListView(core.MarkupContainer):
         return _ListItemModel(self, index)
 
 
+def _render_items(container, element):
+    # stamp rows from skeleton
+    skel = element.fork()
+    skel.qname = markup.DIV
+    del element[:]
+    for c in container._children or ():
+        element.extend(c.on_render(skel.copy()))
+    return element
+
+
 class _ListItem(core.MarkupContainer):
 
+    __slots__ = ('__index',)
+
     def __init__(self, index, model):
         super().__init__(str(index), model)
         self.__index = index
@@ -95,10 +108,111 @@ class _ListItemModel(mm.Model):
 
 class PropertyListView(ListView):
 
+    __slots__ = ()
+
     def new_model(self, index):
         return mm.CompoundModel(super().new_model(index))
 
 
+class DataProvider(metaclass=abc.ABCMeta):
+
+    @abc.abstractmethod
+    def size(self):
+        pass
+
+    @abc.abstractmethod
+    def iterator(self, offset, count):
+        pass
+
+    def model(self, object):
+        return mm.Model(object)
+
+
+class ListDataProvider(DataProvider):
+
+    def __init__(self, list):
+        self.list = list
+
+    def size(self):
+        return len(self.list)
+
+    def iterator(self, offset, count):
+        return iter(self.list[offset:offset + count])
+
+
+class DataView(core.MarkupContainer):
+
+    __slots__ = ('provider', 'items_per_page', 'page_parameter', '_populate_item',
+                 '__current_page', '__item_count')
+
+    def __init__(self, id, provider, items_per_page=None, populate_item=None):
+        super().__init__(id)
+        self.provider = provider
+        self.items_per_page = items_per_page
+        self.page_parameter = None
+        self._populate_item = populate_item
+        self.__current_page = 0
+        self.__item_count = None
+
+    def current_page():
+        def fget(self):
+            return min(self.__current_page, self.page_count - 1)
+
+        def fset(self, current_page):
+            self.__current_page = max(current_page, 0)
+
+        return locals()
+
+    current_page = property(**current_page())
+
+    @property
+    def item_count(self):
+        # provider is asked only once
+        if self.__item_count is None:
+            self.__item_count = self.provider.size()
+        return self.__item_count
+
+    @property
+    def page_count(self):
+        if not self.items_per_page:
+            return 1
+        return max(-(-self.item_count // self.items_per_page), 1)
+
+    def on_configure(self):
+        super().on_configure()
+        # current page from query
+        v = self.request.query.get(self.page_parameter or self.path())
+        if v:
+            try:
+                self.current_page = int(v[0])
+            except ValueError:
+                pass
+
+    def on_before_render(self):
+        if self.items_per_page:
+            offset = self.current_page * self.items_per_page
+            count = min(self.items_per_page, self.item_count - offset)
+        else:
+            offset = 0
+            count = self.item_count
+        if 0 < count:
+            for i, o in enumerate(self.provider.iterator(offset, count), offset):
+                di = self.new_item(i, self.provider.model(o))
+                self.add(di)
+                self.populate_item(di)
+        super().on_before_render()
+
+    def on_render(self, element):
+        return _render_items(self, element)
+
+    def populate_item(self, item):
+        if callable(self._populate_item):
+            return self._populate_item(item)
+
+    def new_item(self, index, model):
+        return _ListItem(index, model)
+
+
 class ContextPathGenerator(core.AttributeModifier):
 
     def __init__(self, attr, rel_path):
@@ -110,6 +224,8 @@ class ContextPathGenerator(core.AttributeModifier):
 
 class ContextImage(core.Component):
 
+    __slots__ = ()
+
     def __init__(self, id, rel_path):
         super().__init__(id)
         self.add(ContextPathGenerator('src', rel_path))
@@ -117,6 +233,8 @@ class ContextImage(core.Component):
 
 class ContextLink(core.Component):
 
+    __slots__ = ()
+
     def __init__(self, id, rel_path):
         super().__init__(id)
         self.add(ContextPathGenerator('href', rel_path))
@@ -15,6 +15,8 @@ __all__ = ['Border', 'FeedbackFieldBorder']
 
 class Border(core.MarkupContainer):
 
+    __slots__ = ('body', '__body')
+
     def __init__(self, id, model=None):
         super().__init__(id, model)
         self.has_markup = True
@@ -28,11 +30,7 @@ class Border(core.MarkupContainer):
         return super().add(*args)
 
     def add(self, *args):
-        for o in args:
-            if isinstance(o, core._MessageContainer):
-                self.add_to_border(o)
-            else:
-                self.body.add(o)
+        self.body.add(*args)
         return self
 
     def on_render(self, element):
@@ -67,7 +65,7 @@ class Border(core.MarkupContainer):
             raise RenderingError(self, "'ayame:body' element is not found")
         # append ayame:head element to Page
         if ayame_head is not None:
-            self.page().head.extend(ayame_head)
+            self.contribute_head(ayame_head)
         # render border
         element[:] = ayame_border
         return super().on_render(element)
@@ -84,6 +82,8 @@ class Border(core.MarkupContainer):
 
 class _BorderBodyContainer(core.MarkupContainer):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None):
         super().__init__(id + '_body', model)
         self.render_body_only = True
@@ -100,6 +100,8 @@ class _BorderBodyContainer(core.MarkupContainer):
 
 class FeedbackFieldBorder(Border):
 
+    __slots__ = ('__feedback',)
+
     def __init__(self, id):
         super().__init__(id)
         self.render_body_only = False
@@ -8,6 +8,8 @@
 
 import collections
 import html
+import itertools
+import time
 import wsgiref.headers
 
 from . import http, local, markup, util
@@ -15,15 +17,25 @@ from . import model as mm
 from .exception import AyameError, ComponentError, RenderingError
 
 
-__all__ = ['AYAME_PATH', 'Component', 'MarkupContainer', 'Page', 'Behavior',
-           'AttributeModifier', 'nested']
+__all__ = ['AYAME_PATH', 'Component', 'MarkupContainer', 'Page', 'Cacheable',
+           'Behavior', 'AttributeModifier', 'nested']
 
 # marker for firing component
 AYAME_PATH = 'ayame:path'
 
+# HTML elements
+_SCRIPT = markup.QName(markup.XHTML_NS, 'script')
+_STYLE = markup.QName(markup.XHTML_NS, 'style')
+
+# HTML attributes
+_SRC = markup.QName(markup.XHTML_NS, 'src')
+
 
 class Component:
 
+    __slots__ = ('__id', '__model', 'parent', 'escape_model_string', 'render_body_only',
+                 'visible', '_behaviors', '_path')
+
     def __init__(self, id, model=None):
         if (not isinstance(self, Page)
             and id is None):
@@ -35,7 +47,8 @@ class Component:
         self.escape_model_string = True
         self.render_body_only = False
         self.visible = True
-        self.behaviors = []
+        self._behaviors = None
+        self._path = None
 
     @property
     def id(self):
@@ -72,7 +85,7 @@ class Component:
                         c.model = None
                     # push children
                     if isinstance(c, MarkupContainer):
-                        queue.extend(reversed(c.children))
+                        queue.extend(reversed(c._children or ()))
 
         return locals()
 
@@ -91,6 +104,21 @@ class Component:
 
     model_object = property(**model_object())
 
+    def behaviors():
+        def fget(self):
+            # allocated on first use
+            if self._behaviors is None:
+                self._behaviors = []
+            return self._behaviors
+
+        def fset(self, behaviors):
+            self._behaviors = behaviors
+            self._reset_hooks()
+
+        return locals()
+
+    behaviors = property(**behaviors())
+
     @property
     def app(self):
         return local.app()
@@ -116,6 +144,7 @@ class Component:
             if isinstance(o, Behavior):
                 self.behaviors.append(o)
                 o.component = self
+                self._reset_hooks()
         return self
 
     def converter_for(self, value):
@@ -132,10 +161,15 @@ class Component:
             return
         path.reverse()
         # find form element
-        m = par.load_markup()
+        m = par._shared_markup()
         if m.root is None:
             # markup is empty
             return
+        elif m.ids is not None:
+            elem = m.find(path)
+            # m is shared, so it should be copied
+            return _clone(self, elem) if elem is not None else None
+        # markup is not indexed
         elem = m.root
         while path:
             for elem, _ in elem.walk():
@@ -144,7 +178,8 @@ class Component:
             else:
                 return
             del path[0]
-        return elem
+        # m is shared, so it should be copied
+        return _clone(self, elem)
 
     def forward(self, *args, **kwargs):
         return self.app.forward(*args, **kwargs)
@@ -179,12 +214,25 @@ class Component:
         return curr
 
     def path(self):
-        lis = [self]
-        lis.extend(self.iter_parent())
-        if (isinstance(lis[-1], Page)
-            and lis[-1].id is None):
-            del lis[-1]
-        return ':'.join(c.id for c in reversed(lis))
+        if self._path is None:
+            lis = [self]
+            lis.extend(self.iter_parent())
+            if (isinstance(lis[-1], Page)
+                and lis[-1].id is None):
+                del lis[-1]
+            self._path = ':'.join(c.id for c in reversed(lis))
+        return self._path
+
+    def _reset_path(self):
+        self._path = None
+
+    def _reset_hooks(self):
+        # lifecycle hooks of ancestors should be collected again
+        c = self.parent
+        while (c is not None
+               and c._subtree_hooks is not None):
+            c._subtree_hooks = None
+            c = c.parent
 
     def redirect(self, *args, **kwargs):
         return self.app.redirect(*args, **kwargs)
@@ -206,20 +254,20 @@ class Component:
             return element
 
     def on_configure(self):
-        for b in self.behaviors:
+        for b in self._behaviors or ():
             b.on_configure(self)
 
     def on_before_render(self):
-        for b in self.behaviors:
+        for b in self._behaviors or ():
             b.on_before_render(self)
 
     def on_render(self, element):
-        for b in self.behaviors:
+        for b in self._behaviors or ():
             b.on_component(self, element)
         return element
 
     def on_after_render(self):
-        for b in self.behaviors:
+        for b in self._behaviors or ():
             b.on_after_render(self)
 
     def tr(self, key, component=None):
@@ -234,14 +282,34 @@ class Component:
 
 class MarkupContainer(Component):
 
+    __slots__ = ('_children', 'has_markup', '_ref', '__head', '_subtree_hooks', '_contributions')
+
     markup_type = markup.MarkupType('.html', 'text/html', ())
 
     def __init__(self, id, model=None):
         super().__init__(id, model)
-        self.children = []
+        self._children = None
         self.has_markup = False
-        self._ref = {}
+        self._ref = None
         self.__head = None
+        self._subtree_hooks = None
+        self._contributions = None
+
+    def children():
+        def fget(self):
+            # allocated on first use
+            if self._children is None:
+                self._children = []
+            return self._children
+
+        def fset(self, children):
+            self._children = children
+            self._subtree_hooks = None
+            self._reset_hooks()
+
+        return locals()
+
+    children = property(**children())
 
     def head():
         def fget(self):
@@ -251,19 +319,77 @@ class MarkupContainer(Component):
 
         def fset(self, head):
             self.__head = head
+            self._contributions = None
 
         return locals()
 
     head = property(**head())
 
+    def contribute_head(self, nodes):
+        self.page()._merge_head(self.__class__, nodes)
+
+    def _merge_head(self, class_, nodes):
+        c = self._head_contributions()
+        nodes = tuple(nodes)
+        for r in c.recorders:
+            r.append((class_, nodes))
+        # deduplicate by component class and content
+        key = (class_, _signature_of(nodes))
+        if key in c.seen:
+            return
+        c.seen[key] = None
+
+        def strip():
+            # remove preceding whitespace
+            while (buf
+                   and isinstance(buf[-1], str)
+                   and not buf[-1].strip()):
+                del buf[-1]
+
+        aggregate = self.config['ayame.markup.head.aggregate']
+        buf = []
+        for n in nodes:
+            if not isinstance(n, markup.Element):
+                buf.append(n)
+                continue
+            if (aggregate
+                and n.qname in (_SCRIPT, _STYLE)
+                and _SRC not in n.attrib
+                and all(isinstance(v, str) for v in n)):
+                # merge into the first inline element
+                key = (n.qname, frozenset(n.attrib.items()))
+                elem = c.seen.get(key)
+                if elem is not None:
+                    elem.append('\n')
+                    elem.extend(n)
+                    strip()
+                    continue
+                c.seen[key] = n = n.fork()
+            buf.append(n)
+        self.head.extend(buf)
+
+    def _head_contributions(self):
+        if self._contributions is None:
+            self._contributions = _HeadContributions()
+        return self._contributions
+
     def add(self, *args):
         for o in args:
             if isinstance(o, Component):
-                if o.id in self._ref:
+                if self._ref is None:
+                    self._ref = {}
+                elif o.id in self._ref:
                     raise ComponentError(self, f"component for '{o.id}' already exists")
                 self.children.append(o)
                 self._ref[o.id] = o
                 o.parent = self
+                o._reset_hooks()
+                # paths are changed by re-parenting
+                if isinstance(o, MarkupContainer):
+                    for c, _ in o.walk():
+                        c._reset_path()
+                else:
+                    o._reset_path()
             else:
                 super().add(o)
         return self
@@ -273,7 +399,7 @@ class MarkupContainer(Component):
             return self
         p = path.split(':', 1)
         id, tail = p[0], p[1] if len(p) > 1 else None
-        c = self._ref.get(id)
+        c = self._ref.get(id) if self._ref is not None else None
         return c.find(tail) if isinstance(c, MarkupContainer) else c
 
     def walk(self, step=None):
@@ -286,7 +412,7 @@ class MarkupContainer(Component):
                 and (step is None
                      or step(component, depth))):
                 queue.extend((c, depth + 1)
-                             for c in reversed(component.children))
+                             for c in reversed(component._children or ()))
 
     def fire(self):
         if self.request.path:
@@ -298,39 +424,33 @@ class MarkupContainer(Component):
 
     def on_configure(self):
         super().on_configure()
-        for c in self.children:
-            c.on_configure()
+        self._dispatch('on_configure', False)
 
     def on_before_render(self):
         super().on_before_render()
-        for c in self.children:
-            if c.visible:
-                c.on_before_render()
+        self._dispatch('on_before_render', True)
 
     def on_render(self, element):
         def push(queue, node):
-            if isinstance(node, markup.Element):
-                for i in range(len(node) - 1, -1, -1):
-                    n = node[i]
-                    if isinstance(n, markup.Element):
-                        queue.append((node, i, n))
-
-        def pop_while(queue, parent):
-            while queue:
-                q = queue.pop()
-                if q[0] != parent:
-                    queue.append(q)
-                    break
-                yield q
+            if (isinstance(node, markup.Element)
+                and node.static is None):
+                # wrap child elements in cells
+                node[:] = [_Cell((n,)) if isinstance(n, markup.Element) and n.static is None else n
+                           for n in node]
+                nodes.append(node)
+                queue.extend((c, c[0]) for c in reversed(node)
+                             if c.__class__ is _Cell)
 
         # notify behaviors
         element = super().on_render(element)
 
         queue = collections.deque()
+        nodes = []
+        root = _Cell((element,))
         if isinstance(element, markup.Element):
-            queue.append((None, -1, element))
+            queue.append((root, element))
         while queue:
-            parent, i, elem = queue.pop()
+            cell, elem = queue.pop()
             value = self.on_render_element(elem)
             if isinstance(value, markup.Element):
                 ayame_id, value = self.on_render_attrib(value)
@@ -339,54 +459,43 @@ class MarkupContainer(Component):
             if ayame_id is None:
                 if (isinstance(value, collections.abc.Iterable)
                     and not isinstance(value, str)):
-                    # replace ayame element (parent)
-                    if parent is None:
-                        element = value
-                    else:
-                        parent[i:i + 1] = value
-                    # assign indices to rendered elements
-                    elems = [(parent, i + j, v)
-                             for j, v in enumerate(value)
-                             if isinstance(v, markup.Element)]
-                    # update indices (increase)
-                    amt = len(value) - 1
-                    elems.extend((t[0], t[1] + amt, t[2])
-                                 for t in pop_while(queue, parent))
-                    # replace ayame element (queue)
-                    queue.extend(reversed(elems))
+                    # replace ayame element
+                    cell[:] = [_Cell((v,)) if isinstance(v, markup.Element) else v
+                               for v in value]
+                    queue.extend((c, c[0]) for c in reversed(cell)
+                                 if c.__class__ is _Cell)
+                    if cell is root:
+                        element = root
                     continue
                 elif isinstance(value, markup.Element):
                     # there is no associated component
                     push(queue, elem)
                     continue
 
-            if parent is None:
-                # replace element itself
-                if value is None:
-                    element = ''
-                else:
-                    element = value
-                    push(queue, element)
-            elif value is None:
+            if value is None:
                 # remove element
-                del parent[i]
-                # update indices (decrease)
-                queue.extend(reversed([(t[0], t[1] - 1, t[2])
-                                       for t in pop_while(queue, parent)]))
+                del cell[:]
+                if cell is root:
+                    element = ''
             elif (isinstance(value, collections.abc.Iterable)
                   and not isinstance(value, str)):
                 # replace element
-                parent[i:i + 1] = value
-                # update indices (increase)
-                amt = len(value) - 1
-                queue.extend(reversed([(t[0], t[1] + amt, t[2])
-                                       for t in pop_while(queue, parent)]))
+                cell[:] = value
                 for v in value:
                     push(queue, v)
+                if cell is root:
+                    element = root
             else:
                 # replace element
-                parent[i] = value
+                cell[:] = (value,)
                 push(queue, value)
+                if cell is root:
+                    element = value
+        # unwrap cells
+        for node in nodes:
+            node[:] = _flatten(node)
+        if element is root:
+            element = list(_flatten(root))
         return element
 
     def on_render_element(self, element):
@@ -412,23 +521,21 @@ class MarkupContainer(Component):
             c = find(get(element, markup.AYAME_CHILD))
             return element.children if c.visible else None
         elif element.qname == markup.AYAME_MESSAGE:
-            k = get(element, markup.AYAME_KEY, False)
-            mc = _MessageContainer(util.new_token()[:7], k)
-            self.add(mc)
-            element.attrib[markup.AYAME_ID] = mc.id
-            return element
+            k = get(element, markup.AYAME_KEY)
+            v = self.tr(k)
+            if v is None:
+                raise RenderingError(self, f"no value found for ayame:message with key '{k}'")
+            return (v,)
         raise RenderingError(self, f"unknown element 'ayame:{element.qname.name}'")
 
     def on_render_attrib(self, element):
         ayame_id = element.attrib.get(markup.AYAME_ID)
         if markup.AYAME_MESSAGE in element.attrib:
-            # prepare AttributeModifier
             if ayame_id is not None:
+                # prepare AttributeModifier
                 self.find(ayame_id).add(_AttributeLocalizer())
             else:
-                ayame_id = util.new_token()[:7]
-                self.add(_MessageContainer(ayame_id))
-                element.attrib[markup.AYAME_ID] = ayame_id
+                _localize(self, element)
         # render component
         if ayame_id is not None:
             return self.render_component(element)
@@ -458,11 +565,54 @@ class MarkupContainer(Component):
 
     def on_after_render(self):
         super().on_after_render()
-        for c in self.children:
-            if c.visible:
-                c.on_after_render()
+        self._dispatch('on_after_render', True)
+
+    def _dispatch(self, hook, visible):
+        # call hook of children, but the default implementation is inlined to
+        # skip non-overridden hooks
+        if hook not in self._collect_hooks():
+            return
+        for c in self._children or ():
+            if (visible
+                and not c.visible):
+                continue
+            if hook in _overrides(c.__class__):
+                getattr(c, hook)()
+                continue
+            elif c._behaviors:
+                for b in c._behaviors:
+                    if hook in _overrides(b.__class__):
+                        getattr(b, hook)(c)
+            if (isinstance(c, MarkupContainer)
+                and c._children):
+                c._dispatch(hook, visible)
+
+    def _collect_hooks(self):
+        # overridden lifecycle hooks in descendants
+        if self._subtree_hooks is None:
+            hooks = _NO_HOOKS
+            for c in self._children or ():
+                h = _overrides(c.__class__)
+                if h:
+                    hooks |= h
+                if c._behaviors:
+                    for b in c._behaviors:
+                        hooks |= _overrides(b.__class__)
+                if isinstance(c, MarkupContainer):
+                    if c._children:
+                        h = c._collect_hooks()
+                        if h:
+                            hooks |= h
+                    else:
+                        c._subtree_hooks = _NO_HOOKS
+            self._subtree_hooks = hooks
+        return self._subtree_hooks
 
     def load_markup(self):
+        # m will be modified, so it should be copied
+        return _clone(self, self._shared_markup())
+
+    def _shared_markup(self):
         def step(element, depth):
             return element.qname not in (markup.AYAME_CHILD, markup.AYAME_HEAD)
 
@@ -474,38 +624,85 @@ class MarkupContainer(Component):
                         + markup_type.extension)
             return markup_type.extension
 
+        def key_of(class_, path):
+            # module-qualified resource path
+            if path.startswith('.'):
+                path = class_.__name__ + path
+            return f'{class_.__module__}:{path}'
+
+        def superclass_of(class_):
+            superclass = None
+            for c in class_.__bases__:
+                if (not issubclass(c, MarkupContainer)
+                    or c is MarkupContainer):
+                    continue
+                elif superclass is not None:
+                    raise AyameError('does not support multiple inheritance')
+                superclass = c
+            if superclass is None:
+                raise AyameError(f"superclass of '{util.fqon_of(class_)}' is not found")
+            return superclass
+
         res = self.config['ayame.resource.loader']
         loader = self.config['ayame.markup.loader']()
         enc = self.config['ayame.markup.encoding']
         sep = self.config['ayame.markup.separator']
         cache = self.config['ayame.markup.cache']
         class_ = self.__class__
+        # merged markup of ayame:extend chain
+        merged_key = key_of(class_, path_of(class_)) + ':merged'
+        try:
+            chain, m = cache[merged_key]
+        except KeyError:
+            pass
+        else:
+            try:
+                for i, (key, stamp) in enumerate(chain):
+                    if i:
+                        class_ = superclass_of(class_)
+                    path = path_of(class_)
+                    if key != key_of(class_, path):
+                        break
+                    r = res.load(class_, path)
+                    if stamp != (r.mtime, r.size):
+                        break
+                else:
+                    return m
+            except Exception:
+                pass
+            del cache[merged_key]
+            class_ = self.__class__
+        chain = []
         extra_head = []
         ayame_child = None
         while True:
             path = path_of(class_)
-            key = f'{class_.__name__}:{path}'
+            key = key_of(class_, path)
             try:
-                mtime, m = cache[key]
+                stamp, m = cache[key]
             except KeyError:
-                mtime = -1
+                stamp = None
                 m = None
             try:
                 r = res.load(class_, path)
-                if mtime < r.mtime:
+                if stamp != (r.mtime, r.size):
                     with r.open(enc) as fp:
                         m = loader.load(class_, fp)
-                    cache[key] = (r.mtime, m)
+                    stamp = (r.mtime, r.size)
+                    cache[key] = (stamp, m)
             except Exception:
                 try:
                     del cache[key]
                 except KeyError:
                     pass
                 raise
-            # m will be modified, so it should be copied
-            m = m.copy()
+            chain.append((key, stamp))
+            if len(chain) > 1:
+                # supermarkup will be modified, so it should be forked
+                m = m.fork()
             if m.root is None:
                 # markup is empty
+                extra_head = None
                 break
 
             stack = []
@@ -515,17 +712,7 @@ class MarkupContainer(Component):
                 if elem.qname == markup.AYAME_EXTEND:
                     if ayame_extend is None:
                         # resolve superclass
-                        superclass = None
-                        for c in class_.__bases__:
-                            if (not issubclass(c, MarkupContainer)
-                                or c is MarkupContainer):
-                                continue
-                            elif superclass is not None:
-                                raise AyameError('does not support multiple inheritance')
-                            superclass = c
-                        if superclass is None:
-                            raise AyameError(f"superclass of '{util.fqon_of(class_)}' is not found")
-                        class_ = superclass
+                        class_ = superclass_of(class_)
                         ayame_extend = elem
                 elif elem.qname == markup.AYAME_CHILD:
                     if ayame_child is not None:
@@ -554,9 +741,12 @@ class MarkupContainer(Component):
         if extra_head:
             if ayame_head is None:
                 # merge to head element
-                for node in m.root:
+                for i, node in enumerate(m.root):
                     if (isinstance(node, markup.Element)
                         and node.qname == markup.HEAD):
+                        if node.static is not None:
+                            # head element is shared with cached markup
+                            m.root[i] = node = node.fork()
                         node.type = markup.Element.OPEN
                         node.extend(extra_head)
                         extra_head = None
@@ -567,6 +757,9 @@ class MarkupContainer(Component):
                 extra_head = None
             if extra_head is not None:
                 raise RenderingError(class_, "'head' element is not found")
+        if len(chain) > 1:
+            m.index()
+            cache[merged_key] = (tuple(chain), m)
         return m
 
     def find_head(self, root):
@@ -574,39 +767,74 @@ class MarkupContainer(Component):
                 and root.qname == markup.HTML):
             raise RenderingError(self, "root element is not 'html'")
 
-        for node in root:
+        for i, node in enumerate(root):
             if (isinstance(node, markup.Element)
                 and node.qname == markup.HEAD):
+                if node.static is not None:
+                    # head element will be modified by components
+                    root[i] = node = node.fork()
                 node.type = markup.Element.OPEN
                 return node
 
 
-class _MessageContainer(MarkupContainer):
+# lifecycle hooks
+_HOOKS = ('on_configure', 'on_before_render', 'on_after_render')
 
-    def __init__(self, id, key=None):
-        if key is not None:
-            # ayame:message element
-            super().__init__(id, mm.Model(key))
-            self.render_body_only = True
-        else:
-            # ayame:message attribute
-            super().__init__(id)
-            self.add(_AttributeLocalizer())
+# overridden lifecycle hooks for class
+_hooks = {}
+_NO_HOOKS = frozenset()
 
-    def on_render(self, element):
-        k = self.model_object
-        if k is not None:
-            v = self.parent.tr(k)
-            if v is None:
-                raise RenderingError(self.parent, f"no value found for ayame:message with key '{k}'")
-            element[:] = (v,)
-            return element
-        # notify behaviors and render components
-        return super().on_render(element)
+
+def _overrides(class_):
+    try:
+        return _hooks[class_]
+    except KeyError:
+        pass
+    if issubclass(class_, MarkupContainer):
+        base = MarkupContainer
+    elif issubclass(class_, Component):
+        base = Component
+    else:
+        base = Behavior
+    _hooks[class_] = hooks = frozenset(n for n in _HOOKS
+                                       if getattr(class_, n) is not getattr(base, n))
+    return hooks
+
+
+class _HeadContributions:
+
+    __slots__ = ('seen', 'recorders')
+
+    def __init__(self):
+        self.seen = {}
+        self.recorders = []
+
+
+def _signature_of(node):
+    if isinstance(node, markup.Element):
+        return (node.qname, frozenset(node.attrib.items()), _signature_of(node.children))
+    elif isinstance(node, (list, tuple)):
+        return tuple(_signature_of(n) for n in node)
+    return node
+
+
+class _Cell(list):
+
+    __slots__ = ()
+
+
+def _flatten(cells):
+    for c in cells:
+        if c.__class__ is _Cell:
+            yield from _flatten(c)
+        else:
+            yield c
 
 
 class Page(MarkupContainer):
 
+    __slots__ = ('status', '__headers', 'headers')
+
     def __init__(self):
         super().__init__(None)
         self.has_markup = True
@@ -616,23 +844,18 @@ class Page(MarkupContainer):
 
     def __call__(self):
         self.fire()
-        content = self.render()
-        return self.status, self.__headers, [content]
+        if self.config['ayame.markup.streaming']:
+            content = self.stream()
+        else:
+            content = [self.render()]
+        return self.status, self.__headers, content
 
     def render(self):
-        # load markup and render components
-        m = self.load_markup()
-        if m.root is None:
+        m = self.__render()
+        if m is None:
             # markup is empty
             content = b''
         else:
-            # find head element for ayame:head element
-            self.head = self.find_head(m.root)
-            m.root = super().render(m.root)
-            # remove ayame namespace from root element
-            for pfx in tuple(m.root.ns):
-                if m.root.ns[pfx] == markup.AYAME_NS:
-                    del m.root.ns[pfx]
             # render markup
             renderer = self.config['ayame.markup.renderer']()
             pretty = self.config['ayame.markup.pretty']
@@ -642,6 +865,115 @@ class Page(MarkupContainer):
         self.headers['Content-Length'] = str(len(content))
         return content
 
+    def stream(self):
+        m = self.__render()
+        if m is None:
+            # markup is empty
+            content = iter(())
+        else:
+            # render markup lazily
+            renderer = self.config['ayame.markup.renderer']()
+            pretty = self.config['ayame.markup.pretty']
+            content = renderer.stream(self, m, pretty=pretty, buffer_size=self.config['ayame.markup.buffer_size'])
+            # serialize the first chunk eagerly so that errors in it become 500;
+            # errors in later chunks abort the response
+            content = itertools.chain((next(content),), content)
+        # HTTP headers
+        self.headers['Content-Type'] = f'{self.markup_type.mime_type}; charset=UTF-8'
+        return content
+
+    def __render(self):
+        # load markup and render components
+        m = self.load_markup()
+        if m.root is not None:
+            # find head element for ayame:head element
+            self.head = self.find_head(m.root)
+            m.root = super().render(m.root)
+            # remove ayame namespace from root element
+            for pfx in tuple(m.root.ns):
+                if m.root.ns[pfx] == markup.AYAME_NS:
+                    del m.root.ns[pfx]
+            return m
+
+
+class Cacheable:
+
+    # mixin for MarkupContainer
+    cache_ttl = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__entry = None
+
+    def cache_key(self):
+        pass
+
+    def on_before_render(self):
+        self.__entry = self.__lookup()
+        if self.__entry is None:
+            super().on_before_render()
+
+    def on_render(self, element):
+        def fork(nodes):
+            return tuple(n.fork() if isinstance(n, markup.Element) else n
+                         for n in nodes)
+
+        p = self.__page()
+        e = self.__entry
+        if e is not None:
+            # replay contributions to head element
+            if p is not None:
+                for class_, nodes in e[2]:
+                    p._merge_head(class_, fork(nodes))
+            return e[1].fork()
+
+        # record contributions to head element
+        contrib = []
+        if p is not None:
+            p._head_contributions().recorders.append(contrib)
+        try:
+            element = super().on_render(element)
+        finally:
+            if p is not None:
+                p._head_contributions().recorders.remove(contrib)
+        key = self.__key()
+        if (key is not None
+            and isinstance(element, markup.Element)):
+            # wall-clock time, entries might be shared with other processes
+            expires = time.time() + self.cache_ttl if self.cache_ttl is not None else None
+            contrib = tuple((class_, fork(nodes)) for class_, nodes in contrib)
+            self.config['ayame.render.cache'][key] = (expires, element.fork(), contrib)
+        return element
+
+    def on_after_render(self):
+        if self.__entry is None:
+            super().on_after_render()
+
+    def __key(self):
+        k = self.cache_key()
+        if k is not None:
+            p = self.__page()
+            return (p.__class__ if p is not None else None, self.path(), self.__class__,
+                    self.request.locale if self.request is not None else None, k)
+
+    def __lookup(self):
+        key = self.__key()
+        if key is not None:
+            cache = self.config['ayame.render.cache']
+            e = cache.get(key)
+            if e is not None:
+                if (e[0] is None
+                    or time.time() < e[0]):
+                    return e
+                # expired
+                cache.pop(key, None)
+
+    def __page(self):
+        try:
+            return self.page()
+        except ComponentError:
+            pass
+
 
 class Behavior:
 
@@ -715,15 +1047,27 @@ class AttributeModifier(Behavior):
 class _AttributeLocalizer(Behavior):
 
     def on_component(self, component, element):
-        for s in element.attrib.pop(markup.AYAME_MESSAGE).split(','):
-            try:
-                name, key = s.rsplit(':', 1)
-            except ValueError:
-                raise RenderingError(component, 'invalid value is found in ayame:message attribute')
-            v = component.tr(key)
-            if v is not None:
-                attr = markup.QName(element.qname.ns_uri, name)
-                element.attrib[attr] = v
+        _localize(component, element)
+
+
+def _clone(component, node):
+    # static subtrees are shared with the original only when enabled, and
+    # components must not modify them then
+    if component.config['ayame.markup.share_static']:
+        return node.fork()
+    return node.copy()
+
+
+def _localize(component, element):
+    for s in element.attrib.pop(markup.AYAME_MESSAGE).split(','):
+        try:
+            name, key = s.rsplit(':', 1)
+        except ValueError:
+            raise RenderingError(component, 'invalid value is found in ayame:message attribute')
+        v = component.tr(key)
+        if v is not None:
+            attr = markup.QName(element.qname.ns_uri, name)
+            element.attrib[attr] = v
 
 
 class nested:
@@ -47,6 +47,8 @@ _SELECTED = markup.QName(markup.XHTML_NS, 'selected')
 
 class Form(core.MarkupContainer):
 
+    __slots__ = ('_method',)
+
     def __init__(self, id, model=None):
         super().__init__(id, model)
         self._method = None
@@ -124,7 +126,7 @@ class Form(core.MarkupContainer):
                     valid = c.error is None
             # push children
             if isinstance(c, core.MarkupContainer):
-                queue.extend(reversed(c.children))
+                queue.extend(reversed(c._children or ()))
         if not valid:
             if button is not None:
                 button.on_error()
@@ -153,18 +155,27 @@ class Form(core.MarkupContainer):
 
 class FormComponent(core.MarkupContainer):
 
+    __slots__ = ('required', 'type', 'error', '_relative_path')
+
     def __init__(self, id, model=None):
         super().__init__(id, model)
         self.required = False
         self.type = None
         self.error = None
+        self._relative_path = None
 
     def relative_path(self):
-        lis = [self.id]
-        lis.extend(c.id for c in self.iter_parent(Form))
-        # relative path from Form
-        del lis[-1]
-        return ':'.join(reversed(lis))
+        if self._relative_path is None:
+            lis = [self.id]
+            lis.extend(c.id for c in self.iter_parent(Form))
+            # relative path from Form
+            del lis[-1]
+            self._relative_path = ':'.join(reversed(lis))
+        return self._relative_path
+
+    def _reset_path(self):
+        super()._reset_path()
+        self._relative_path = None
 
     def validate(self, value):
         try:
@@ -175,7 +186,7 @@ class FormComponent(core.MarkupContainer):
             # convert to object
             o = self.convert(value)
             # validate
-            for b in self.behaviors:
+            for b in self._behaviors or ():
                 if isinstance(b, validator.Validator):
                     b.validate(o)
         except ValidationError as e:
@@ -222,6 +233,8 @@ class FormComponent(core.MarkupContainer):
 
 class Button(FormComponent):
 
+    __slots__ = ()
+
     def on_render(self, element):
         if element.qname == _INPUT:
             if element.attrib[_TYPE] not in ('submit', 'button', 'image'):
@@ -245,6 +258,8 @@ class Button(FormComponent):
 
 class FileUploadField(FormComponent):
 
+    __slots__ = ()
+
     def on_render(self, element):
         if element.qname != _INPUT:
             raise RenderingError(self, "'input' element is expected")
@@ -258,6 +273,8 @@ class FileUploadField(FormComponent):
 
 class TextField(FormComponent):
 
+    __slots__ = ()
+
     input_type = 'text'
 
     def on_render(self, element):
@@ -274,16 +291,22 @@ class TextField(FormComponent):
 
 class PasswordField(TextField):
 
+    __slots__ = ()
+
     input_type = 'password'
 
 
 class HiddenField(TextField):
 
+    __slots__ = ()
+
     input_type = 'hidden'
 
 
 class TextArea(FormComponent):
 
+    __slots__ = ()
+
     def on_render(self, element):
         if element.qname != _TEXTAREA:
             raise RenderingError(self, "'textarea' element is expected")
@@ -298,6 +321,8 @@ class TextArea(FormComponent):
 
 class CheckBox(FormComponent):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None):
         super().__init__(id, model)
         self.type = bool
@@ -322,6 +347,8 @@ class CheckBox(FormComponent):
 
 class Choice(FormComponent):
 
+    __slots__ = ('choices', 'renderer', 'multiple', 'prefix', 'suffix')
+
     def __init__(self, id, model=None, choices=None, renderer=None):
         super().__init__(id, model)
         self.choices = choices if choices is not None else []
@@ -378,6 +405,8 @@ class ChoiceRenderer:
 
 class RadioChoice(Choice):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None, choices=None, renderer=None):
         super().__init__(id, model, choices, renderer)
         self.suffix[:] = (markup.Element(_BR, type=markup.Element.EMPTY),)
@@ -423,6 +452,8 @@ class RadioChoice(Choice):
 
 class CheckBoxChoice(Choice):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None, choices=None, renderer=None):
         super().__init__(id, model, choices, renderer)
         self.suffix[:] = (markup.Element(_BR, type=markup.Element.EMPTY),)
@@ -470,6 +501,8 @@ class CheckBoxChoice(Choice):
 
 class SelectChoice(Choice):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None, choices=None, renderer=None):
         super().__init__(id, model, choices, renderer)
 
@@ -69,16 +69,16 @@ class Localizer:
             name = '_'.join(args)
             key = module.__name__ + ':' + name
             try:
-                mtime, bundle = cache[key]
+                stamp, bundle = cache[key]
             except KeyError:
-                mtime = -1
+                stamp = None
                 bundle = None
             try:
                 r = res.load(module, name + self.extension)
-                if mtime < r.mtime:
+                if stamp != (r.mtime, r.size):
                     with r.open() as fp:
                         bundle = self._load(fp)
-                    cache[key] = (r.mtime, bundle)
+                    cache[key] = ((r.mtime, r.size), bundle)
             except (OSError, ResourceError):
                 bundle = None
                 try:
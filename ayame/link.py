@@ -29,6 +29,8 @@ _SRC = markup.QName(markup.XHTML_NS, 'src')
 
 class Link(core.MarkupContainer):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None):
         if isinstance(model, str):
             model = mm.Model(model)
@@ -61,6 +63,8 @@ class Link(core.MarkupContainer):
 
 class ActionLink(Link):
 
+    __slots__ = ()
+
     def on_fire(self):
         self.on_click()
 
@@ -75,6 +79,8 @@ class ActionLink(Link):
 
 class PageLink(Link):
 
+    __slots__ = ('_page', '_values', '_anchor')
+
     def __init__(self, id, page, values=None, anchor=''):
         super().__init__(id, None)
         if (not issubclass(page, core.Page)
@@ -9,6 +9,7 @@
 import abc
 import collections
 import collections.abc
+import html
 import html.parser
 import io
 import re
@@ -22,7 +23,7 @@ __all__ = ['XML_NS', 'XHTML_NS', 'AYAME_NS', 'XHTML1_STRICT', 'QName',
            'AYAME_EXTEND', 'AYAME_CHILD', 'AYAME_PANEL', 'AYAME_BORDER',
            'AYAME_BODY', 'AYAME_HEAD', 'AYAME_MESSAGE', 'AYAME_REMOVE',
            'AYAME_ID', 'AYAME_KEY', 'MarkupType', 'Markup', 'Element',
-           'Fragment', 'MarkupLoader', 'MarkupRenderer', 'Space',
+           'Fragment', 'MarkupLoader', 'FastMarkupLoader', 'MarkupRenderer', 'Space',
            'MarkupHandler', 'MarkupPrettifier', 'XMLHandler', 'XHTML1Handler']
 
 # namespace URI
@@ -138,13 +139,15 @@ MarkupType = collections.namedtuple('MarkupType', 'extension, mime_type, scope')
 
 class Markup:
 
-    __slots__ = ('xml_decl', 'lang', 'doctype', 'root')
+    __slots__ = ('xml_decl', 'lang', 'doctype', 'root', 'ids')
 
     def __init__(self):
         self.xml_decl = {}
         self.lang = None
         self.doctype = None
         self.root = None
+        # ayame:id -> positions of elements
+        self.ids = None
 
     def __copy__(self):
         m = self.__class__()
@@ -155,18 +158,60 @@ class Markup:
             m.root = self.root.copy()
         return m
 
+    def fork(self):
+        m = self.__class__()
+        m.xml_decl = self.xml_decl.copy()
+        m.lang = self.lang
+        m.doctype = self.doctype
+        if self.root is not None:
+            m.root = self.root.fork()
+        return m
+
     def __getstate__(self):
-        return (self.xml_decl, self.lang, self.doctype, self.root)
+        return (self.xml_decl, self.lang, self.doctype, self.root, self.ids)
 
     def __setstate__(self, state):
-        self.xml_decl, self.lang, self.doctype, self.root = state
+        self.xml_decl, self.lang, self.doctype, self.root, self.ids = state
 
     copy = __copy__
 
+    def index(self):
+        ids = {}
+        if self.root is not None:
+            queue = [((), self.root)]
+            while queue:
+                pos, elem = queue.pop()
+                id = elem.attrib.get(AYAME_ID)
+                if id is not None:
+                    ids.setdefault(id, []).append(pos)
+                # push child elements
+                queue.extend((pos + (i,), elem[i])
+                             for i in range(len(elem) - 1, -1, -1)
+                             if isinstance(elem[i], Element))
+        self.ids = {id: tuple(v) for id, v in ids.items()}
+
+    def find(self, path):
+        if (self.root is None
+            or self.ids is None):
+            return
+        # find element in document order
+        pos = ()
+        for id in path:
+            for p in self.ids.get(id, ()):
+                if p[:len(pos)] == pos:
+                    pos = p
+                    break
+            else:
+                return
+        elem = self.root
+        for i in pos:
+            elem = elem[i]
+        return elem
+
 
 class Element:
 
-    __slots__ = ('qname', 'attrib', 'type', 'ns', 'children')
+    __slots__ = ('qname', 'attrib', 'type', 'ns', 'children', 'static')
 
     OPEN = 1 << 0
     EMPTY = 1 << 1
@@ -181,6 +226,8 @@ class Element:
         if ns:
             self.ns.update(ns)
         self.children = []
+        # pre-serialized segments for static subtree
+        self.static = None
 
     def __repr__(self):
         return f'<{util.fqon_of(self)} {self.qname!r} at 0x{id(self):x}>'
@@ -207,16 +254,28 @@ class Element:
         elem.ns = self.ns.copy()
         elem.children = [n.copy() if isinstance(n, Element) else n
                          for n in self.children]
+        # pre-serialized segments are not shared with the original
+        elem.static = {} if self.static is not None else None
         return elem
 
     def __getstate__(self):
-        return (self.qname, self.attrib, self.type, self.ns, self.children)
+        return (self.qname, self.attrib, self.type, self.ns, self.children, self.static)
 
     def __setstate__(self, state):
-        self.qname, self.attrib, self.type, self.ns, self.children = state
+        self.qname, self.attrib, self.type, self.ns, self.children, self.static = state
 
     copy = __copy__
 
+    def fork(self):
+        # static subtrees are shared with the original
+        elem = self.__class__(self.qname)
+        elem.attrib = self.attrib.copy()
+        elem.type = self.type
+        elem.ns = self.ns.copy()
+        elem.children = [n.fork() if isinstance(n, Element) and n.static is None else n
+                         for n in self.children]
+        return elem
+
     def append(self, node):
         self.children.append(node)
 
@@ -261,11 +320,26 @@ class _AttributeDict(util.FilterDict):
     __slots__ = ()
 
     def __convert__(self, key):
+        try:
+            return _attr_names[key]
+        except (KeyError, TypeError):
+            pass
         if isinstance(key, QName):
-            return QName(key.ns_uri, key.name.lower())
+            name = QName(key.ns_uri, key.name.lower())
         elif isinstance(key, str):
-            return key.lower()
-        return key
+            name = key.lower()
+        else:
+            return key
+        # intern canonical name
+        if len(_attr_names) < _ATTR_NAMES_MAX:
+            name = _attr_names.setdefault(name, name)
+            _attr_names[key] = name
+        return name
+
+
+# attribute name -> canonical attribute name
+_attr_names = {}
+_ATTR_NAMES_MAX = 8192
 
 
 class Fragment(list):
@@ -307,6 +381,7 @@ class MarkupLoader(html.parser.HTMLParser):
                 break
             self.feed(data)
         self.close()
+        self._markup.index()
         return self._markup
 
     def close(self):
@@ -442,8 +517,24 @@ class MarkupLoader(html.parser.HTMLParser):
             or self._peek().qname != qname):
             raise MarkupError(self._object, self.getpos(),
                               f"end tag for element '{qname}' which is not open")
+        elem = self._peek()
+        if (len(self._stack) > 1
+            and self._is_static(elem)):
+            elem.static = {}
         return self._stack.pop()
 
+    def _is_static(self, element):
+        if element.qname.ns_uri == AYAME_NS:
+            return False
+        for attr in element.attrib:
+            if attr.ns_uri == AYAME_NS:
+                return False
+        for node in element:
+            if (isinstance(node, Element)
+                and node.static is None):
+                return False
+        return True
+
     def _flush_text(self):
         if self._text:
             self._peek().append(''.join(self._text))
@@ -496,6 +587,150 @@ class MarkupLoader(html.parser.HTMLParser):
         return elem
 
 
+# tokens of well-formed markup
+_token_re = re.compile(r"""
+    <
+    (?:
+        # start tag
+        (?P<start> [a-zA-Z] [^\t\n\r\f\ />\x00]*)
+        (?P<attrs>
+            (?:
+                \s+
+                [^\s/>=]+
+                \s* = \s*
+                (?: "[^"]*" | '[^']*')
+            )*
+        )
+        \s*
+        (?P<empty> /?)
+        >
+    |
+        # end tag
+        / (?P<end> [a-zA-Z] [-.a-zA-Z0-9:_]*) \s* >
+    |
+        # comment
+        !-- .*? -- \s* >
+    |
+        # DOCTYPE
+        ! (?P<decl> [dD][oO][cC][tT][yY][pP][eE] [^>]*) >
+    |
+        # processing instruction
+        \? (?P<pi> [^>]*) >
+    )
+""", re.VERBOSE | re.DOTALL)
+_attr_re = re.compile(r"""
+    \s+
+    (?P<name> [^\s/>=]+)
+    \s* = \s*
+    (?P<value> "[^"]*" | '[^']*')
+""", re.VERBOSE)
+_ref_re = re.compile(r"""
+    &
+    (?!
+        \# (?: [0-9]+ | [xX][0-9a-fA-F]+) ;
+    |
+        [a-zA-Z] [-.a-zA-Z0-9]* ;
+    )
+""", re.VERBOSE)
+
+
+class FastMarkupLoader(MarkupLoader):
+
+    def __init__(self):
+        super().__init__()
+        self._data = None
+
+    def load(self, object, src, lang='xhtml1'):
+        data = src.read()
+        self.reset()
+        self._stack.clear()
+        self._cache.clear()
+
+        self._object = object
+        self._markup = Markup()
+        self._markup.lang = lang.lower()
+        self._text = []
+        self._remove = False
+
+        self._data = data
+        self._pos = self._last = self._bol = 0
+        self._lineno = 1
+        try:
+            if not self._scan(data):
+                # fall back to HTMLParser
+                self._data = None
+                return super().load(object, io.StringIO(data), lang)
+            self._pos = len(data)
+            if self._stack:
+                raise MarkupError(self._object, self.getpos(),
+                                  f"end tag for element '{self._peek().qname}' omitted")
+            self._markup.index()
+            return self._markup
+        finally:
+            self._data = None
+
+    def _scan(self, data):
+        pos = 0
+        end = len(data)
+        while pos < end:
+            i = data.find('<', pos)
+            if i < 0:
+                i = end
+            if pos < i:
+                text = data[pos:i]
+                if ('&' in text
+                    and _ref_re.search(text)):
+                    return False
+                self.handle_data(text)
+                if i == end:
+                    break
+            m = _token_re.match(data, i)
+            if not m:
+                return False
+            self._pos = i
+            pos = m.end()
+            name = m.group('start')
+            if name is not None:
+                name = name.lower()
+                attrs = []
+                for a in _attr_re.finditer(m.group('attrs')):
+                    v = a.group('value')[1:-1]
+                    attrs.append((a.group('name').lower(), html.unescape(v) if v else v))
+                if m.group('empty'):
+                    self.handle_startendtag(name, attrs)
+                else:
+                    self.handle_starttag(name, attrs)
+                    if name in self.CDATA_CONTENT_ELEMENTS:
+                        # CDATA content
+                        c = re.compile(fr'</\s*{name}\s*>', re.IGNORECASE).search(data, pos)
+                        if not c:
+                            return False
+                        i = c.start()
+                        if pos < i:
+                            self.handle_data(data[pos:i])
+                        pos = i
+            elif m.group('end') is not None:
+                self.handle_endtag(m.group('end').lower())
+            elif m.group('decl') is not None:
+                self.handle_decl(m.group('decl'))
+            elif m.group('pi') is not None:
+                self.handle_pi(m.group('pi'))
+        return True
+
+    def getpos(self):
+        if self._data is None:
+            return super().getpos()
+        # count newlines lazily
+        i = self._pos
+        if self._last < i:
+            n = self._data.count('\n', self._last, i)
+            if n:
+                self._lineno += n
+                self._bol = self._data.rindex('\n', self._last, i) + 1
+            self._last = i
+        return self._lineno, i - self._bol
+
+
 class MarkupRenderer:
 
     _registry = {}
@@ -508,10 +743,15 @@ class MarkupRenderer:
         self._stack = collections.deque()
 
     def render(self, object, markup, encoding='utf-8', pretty=False):
+        return b''.join(self.stream(object, markup, encoding, pretty))
+
+    def stream(self, object, markup, encoding='utf-8', pretty=False, buffer_size=None):
         self._stack.clear()
 
         self.object = object
-        self._buf = io.StringIO()
+        self._buf = []
+        # static subtrees are rendered from pre-serialized segments
+        static = not pretty
 
         try:
             h = self._registry[markup.lang.lower()](self)
@@ -529,21 +769,36 @@ class MarkupRenderer:
         h.doctype(markup.doctype)
         # render nodes
         queue = collections.deque(((-1, markup.root),))
+        segment = None
+        size = pos = 0
         while queue:
             index, node = queue.pop()
             if self._stack:
                 self.peek().pending -= 1
             if isinstance(node, Element):
-                # render start tag or empty tag
-                node.type = Element.OPEN if not h.is_empty(node) else Element.EMPTY
-                self.push(index, node)
-                h.start_tag()
-                if node.type == Element.OPEN:
-                    # push children
-                    queue.extend((i, node[i])
-                                 for i in range(len(node) - 1, -1, -1))
-                else:
-                    self.pop()
+                if (static
+                    and segment is None
+                    and node.static is not None):
+                    # static subtree
+                    key = (h.__class__, self.scope())
+                    s = node.static.get(key)
+                    if s is None:
+                        segment = (node, key, len(self._buf))
+                    else:
+                        self.write(s)
+                        node = None
+                if node is not None:
+                    # render start tag or empty tag
+                    node.type = Element.OPEN if not h.is_empty(node) else Element.EMPTY
+                    self.push(index, node)
+                    h.start_tag()
+                    if node.type == Element.OPEN:
+                        # push children
+                        node = self.peek().element
+                        queue.extend((i, node[i])
+                                     for i in range(len(node) - 1, -1, -1))
+                    else:
+                        segment = self._pop(segment)
             elif isinstance(node, str):
                 # render text
                 h.text(index, node)
@@ -553,12 +808,35 @@ class MarkupRenderer:
             while (self._stack
                    and self.peek().pending == 0):
                 h.end_tag()
-                self.pop()
+                segment = self._pop(segment)
+            # flush buffer outside of static subtree
+            if (buffer_size is not None
+                and segment is None):
+                size, pos = self._measure(size, pos)
+                if size >= buffer_size:
+                    yield ''.join(self._buf).encode(encoding)
+                    self._buf.clear()
+                    size = pos = 0
         self.writeln()
         try:
-            return self._buf.getvalue().encode(encoding)
+            yield ''.join(self._buf).encode(encoding)
         finally:
-            self._buf.close()
+            self._buf = None
+
+    def _measure(self, size, pos):
+        n = len(self._buf)
+        if pos < n:
+            size += sum(map(len, self._buf[pos:]))
+        return size, n
+
+    def _pop(self, segment):
+        elem = self.pop().element
+        if (segment is not None
+            and segment[0] is elem):
+            # store pre-serialized static subtree
+            elem.static[segment[1]] = ''.join(self._buf[segment[2]:])
+            return
+        return segment
 
     def xml_decl(self, xml_decl, encoding):
         self.write('<?xml',
@@ -577,15 +855,24 @@ class MarkupRenderer:
         self.writeln('?>')
 
     def write(self, *args):
-        write = self._buf.write
-        for s in args:
-            write(s)
+        self._buf.extend(args)
 
     def writeln(self, *args):
         self.write(*args + ('\n',))
 
     def push(self, index, element):
-        self._stack.append(_ElementState(index, element))
+        st = _ElementState(index, element)
+        if not self._stack:
+            st.scope = (tuple(element.ns.items()),) if element.ns else ()
+            st.prefixes = {}
+        elif element.ns:
+            # new namespace scope
+            st.scope = self._stack[-1].scope + (tuple(element.ns.items()),)
+            st.prefixes = {}
+        else:
+            st.scope = self._stack[-1].scope
+            st.prefixes = self._stack[-1].prefixes
+        self._stack.append(st)
 
     def pop(self):
         return self._stack.pop()
@@ -599,7 +886,14 @@ class MarkupRenderer:
     def depth(self):
         return len(self._stack)
 
+    def scope(self):
+        return self._stack[-1].scope if self._stack else ()
+
     def prefix_for(self, ns_uri):
+        if self._stack:
+            prefixes = self._stack[-1].prefixes
+            if ns_uri in prefixes:
+                return prefixes[ns_uri]
         known = set()
         for i in range(len(self._stack) - 1, -1, -1):
             elem = self.at(i).element
@@ -607,6 +901,7 @@ class MarkupRenderer:
                 if pfx in known:
                     raise RenderingError(self.object, f"namespace URI for '{pfx}' was overwritten")
                 elif elem.ns[pfx] == ns_uri:
+                    prefixes[ns_uri] = pfx
                     return pfx
                 known.add(pfx)
         raise RenderingError(self.object, f"unknown namespace URI '{ns_uri}'")
@@ -614,7 +909,7 @@ class MarkupRenderer:
 
 class _ElementState:
 
-    __slots__ = ('index', 'element', 'pending', 'flags')
+    __slots__ = ('index', 'element', 'pending', 'flags', 'scope', 'prefixes')
 
     def __init__(self, index, element):
         # index in parent element
@@ -625,6 +920,10 @@ class _ElementState:
         self.pending = len(element)
         # indent flags for children
         self.flags = 0
+        # namespace declarations in scope
+        self.scope = ()
+        # namespace URI -> prefix
+        self.prefixes = None
 
 
 class Space(str):
@@ -772,7 +1071,16 @@ class MarkupPrettifier(MarkupHandler):
         h = self._handler
 
         curr = h.renderer.peek()
-        curr.flags = h.compile(curr.element)
+        if curr.element.static is not None:
+            # static element is shared with cached markup, so compile
+            # a fork only once
+            c = curr.element.static.get(h.__class__)
+            if c is None:
+                elem = curr.element.fork()
+                c = curr.element.static[h.__class__] = (h.compile(elem), elem)
+            curr.flags, curr.element = c
+        else:
+            curr.flags = h.compile(curr.element)
         curr.pending = len(curr.element)
 
         if (not self._bol
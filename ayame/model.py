@@ -7,6 +7,7 @@
 #
 
 import abc
+import types
 
 
 __all__ = ['Model', 'InheritableModel', 'WrapModel', 'CompoundModel']
@@ -54,61 +55,139 @@ class WrapModel(Model, metaclass=abc.ABCMeta):
 class CompoundModel(InheritableModel):
 
     def wrap(self, component):
-        class CompoundWrapModel(WrapModel):
-
-            def __init__(self, model):
-                super().__init__(model)
-                self._component = component
-
-            def object():
-                def fget(self):
-                    o = self.wrapped_model.object
-                    name = self._component.id
-                    # instance variable
-                    try:
-                        return getattr(o, name)
-                    except AttributeError:
-                        pass
-                    # getter method
-                    try:
-                        getter = getattr(o, 'get_' + name)
-                        if callable(getter):
-                            return getter()
-                    except AttributeError:
-                        pass
-                    # __getitem__
-                    try:
-                        return o.__getitem__(name)
-                    except (AttributeError, LookupError):
-                        pass
-
-                def fset(self, object):
-                    o = self.wrapped_model.object
-                    name = self._component.id
-                    # instance variable
-                    try:
-                        getattr(o, name)
-                    except AttributeError:
-                        pass
-                    else:
-                        return setattr(o, name, object)
-                    # setter method
-                    try:
-                        setter = getattr(o, 'set_' + name)
-                        if callable(setter):
-                            return setter(object)
-                    except AttributeError:
-                        pass
-                    # __setitem__
-                    try:
-                        return o.__setitem__(name, object)
-                    except AttributeError:
-                        pass
-
-                    raise AttributeError(name)
-
-                return locals()
-
-            object = property(**object())
-
-        return CompoundWrapModel(self)
+        return _CompoundWrapModel(self, component)
+
+
+class _CompoundWrapModel(WrapModel):
+
+    def __init__(self, model, component):
+        super().__init__(model)
+        self._component = component
+
+    def object():
+        def fget(self):
+            o = self.wrapped_model.object
+            name = self._component.id
+            key = (o.__class__, name, False)
+            c = _accessors.get(key)
+            if c is not None:
+                if _shadowed(o, name, c):
+                    key = None
+                else:
+                    found, v = _get(o, name, c)
+                    if found:
+                        return v
+            for s in _STRATEGIES:
+                found, v = _get(o, name, s)
+                if found:
+                    _remember(key, s)
+                    return v
+
+        def fset(self, object):
+            o = self.wrapped_model.object
+            name = self._component.id
+            key = (o.__class__, name, True)
+            c = _accessors.get(key)
+            if c is not None:
+                if _shadowed(o, name, c):
+                    key = None
+                elif _set(o, name, c, object):
+                    return
+            for s in _STRATEGIES:
+                if _set(o, name, s, object):
+                    _remember(key, s)
+                    return
+
+            raise AttributeError(name)
+
+        return locals()
+
+    object = property(**object())
+
+
+# accessor strategies
+_ATTR = 0
+_METHOD = 1
+_ITEM = 2
+
+_STRATEGIES = (_ATTR, _METHOD, _ITEM)
+
+# strategy which succeeded for (type, name, setter)
+_accessors = {}
+_ACCESSORS_MAX = 4096
+
+
+def _get(o, name, strategy):
+    if strategy == _ATTR:
+        # instance variable
+        try:
+            return True, getattr(o, name)
+        except AttributeError:
+            pass
+    elif strategy == _METHOD:
+        # getter method
+        try:
+            getter = getattr(o, 'get_' + name)
+            if callable(getter):
+                return True, getter()
+        except AttributeError:
+            pass
+    else:
+        # __getitem__
+        try:
+            return True, o.__getitem__(name)
+        except (AttributeError, LookupError):
+            pass
+    return False, None
+
+
+def _set(o, name, strategy, object):
+    if strategy == _ATTR:
+        # instance variable
+        try:
+            getattr(o, name)
+        except AttributeError:
+            pass
+        else:
+            setattr(o, name, object)
+            return True
+    elif strategy == _METHOD:
+        # setter method
+        try:
+            setter = getattr(o, 'set_' + name)
+            if callable(setter):
+                setter(object)
+                return True
+        except AttributeError:
+            pass
+    else:
+        # __setitem__
+        try:
+            o.__setitem__(name, object)
+            return True
+        except AttributeError:
+            pass
+    return False
+
+
+def _shadowed(o, name, strategy):
+    # instance variables take precedence over cached strategy
+    if strategy != _ATTR:
+        d = getattr(o, '__dict__', None)
+        for n in ((name,) if strategy == _METHOD else (name, 'get_' + name, 'set_' + name)):
+            if d and n in d:
+                return True
+            elif (isinstance(getattr(o.__class__, n, None), types.MemberDescriptorType)
+                  and hasattr(o, n)):
+                # assigned slot
+                return True
+    return False
+
+
+def _remember(key, strategy):
+    # shadowed by instance variables, or dynamic attributes
+    if not (key is None
+            or hasattr(key[0], '__getattr__')):
+        if len(_accessors) >= _ACCESSORS_MAX:
+            _accessors.clear()
+        _accessors[key] = strategy
@@ -14,6 +14,8 @@ __all__ = ['HTTPStatusPage']
 
 class HTTPStatusPage(core.Page):
 
+    __slots__ = ('_error',)
+
     def __init__(self, error):
         super().__init__()
         self._error = error
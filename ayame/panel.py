@@ -6,16 +6,20 @@
 #   SPDX-License-Identifier: MIT
 #
 
-from . import core, basic, form, markup
+import urllib.parse
+
+from . import core, basic, form, link, markup, uri
 from . import model as mm
 from .exception import RenderingError
 
 
-__all__ = ['Panel', 'FeedbackPanel']
+__all__ = ['Panel', 'FeedbackPanel', 'Pager']
 
 
 class Panel(core.MarkupContainer):
 
+    __slots__ = ()
+
     def __init__(self, id, model=None):
         super().__init__(id, model)
         self.has_markup = True
@@ -44,7 +48,7 @@ class Panel(core.MarkupContainer):
             raise RenderingError(self, "'ayame:panel' element is not found")
         # append ayame:head element to Page
         if ayame_head is not None:
-            self.page().head.extend(ayame_head)
+            self.contribute_head(ayame_head)
         # render panel
         element[:] = ayame_panel
         return super().on_render(element)
@@ -52,6 +56,8 @@ class Panel(core.MarkupContainer):
 
 class FeedbackPanel(Panel):
 
+    __slots__ = ('__errors',)
+
     def __init__(self, id):
         super().__init__(id)
         self.__errors = []
@@ -70,5 +76,61 @@ class FeedbackPanel(Panel):
 
     class _ListView(basic.ListView):
 
+        __slots__ = ()
+
         def populate_item(self, item):
             item.add(basic.Label('message', item.model_object))
+
+
+class Pager(Panel):
+
+    __slots__ = ('view', 'window', '__pages')
+
+    def __init__(self, id, view, window=10):
+        super().__init__(id)
+        self.view = view
+        self.window = window
+        self.__pages = []
+
+        self.add(_PagerLink('first', view, lambda: 0))
+        self.add(_PagerLink('prev', view, lambda: view.current_page - 1))
+        self.add(self._ListView('pages', mm.Model(self.__pages)))
+        self.add(_PagerLink('next', view, lambda: view.current_page + 1))
+        self.add(_PagerLink('last', view, lambda: view.page_count - 1))
+
+    def on_before_render(self):
+        # pages around the current page
+        n = self.view.page_count
+        first = max(min(self.view.current_page - self.window // 2, n - self.window), 0)
+        self.__pages[:] = range(first, min(first + self.window, n))
+        super().on_before_render()
+
+    class _ListView(basic.ListView):
+
+        __slots__ = ()
+
+        def populate_item(self, item):
+            page = item.model_object
+            item.add(_PagerLink('page', self.parent.view, lambda: page, str(page + 1)))
+
+
+class _PagerLink(link.Link):
+
+    __slots__ = ('__view', '__page')
+
+    def __init__(self, id, view, page, model=None):
+        super().__init__(id, model)
+        self.__view = view
+        self.__page = page
+
+    def new_uri(self, _):
+        v = self.__view
+        n = self.__page()
+        if (not 0 <= n < v.page_count
+            or n == v.current_page):
+            return
+        query = {k: l for k, l in self.request.query.items()
+                 if k != core.AYAME_PATH}
+        query[v.page_parameter or v.path()] = [str(n)]
+        environ = self.environ | {'QUERY_STRING': urllib.parse.urlencode(query, doseq=True)}
+        return uri.request_uri(environ, True)
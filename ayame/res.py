@@ -78,6 +78,7 @@ class Resource(metaclass=abc.ABCMeta):
     def __init__(self, path):
         self._path = path
         self._mtime = None
+        self._size = None
 
     @property
     def path(self):
@@ -87,6 +88,10 @@ class Resource(metaclass=abc.ABCMeta):
     def mtime(self):
         return self._mtime
 
+    @property
+    def size(self):
+        return self._size
+
     @abc.abstractmethod
     def open(self, encoding='utf-8'):
         pass
@@ -96,7 +101,9 @@ class FileResource(Resource):
 
     def __init__(self, path):
         super().__init__(path)
-        self._mtime = self._guard(os.stat, self._path).st_mtime
+        st = self._guard(os.stat, self._path)
+        self._mtime = st.st_mtime
+        self._size = st.st_size
 
     def open(self, encoding='utf-8'):
         return self._guard(open, self._path, encoding=encoding)
@@ -116,6 +123,7 @@ class ZipFileResource(Resource):
         with self._guard(zipfile.ZipFile, self._loader.archive) as zf:
             zi = self._guard(zf.getinfo, self._path)
             self._mtime = time.mktime(datetime.datetime(*zi.date_time).timetuple())
+            self._size = zi.file_size
 
     def open(self, encoding='utf-8'):
         return io.StringIO(str(self._guard(self._loader.get_data, self._path), encoding))
@@ -81,6 +81,10 @@ _args_re = re.compile(r"""
 """, re.VERBOSE)
 _sep_re = re.compile(r'[\s,]')
 
+_CacheInfo = collections.namedtuple('CacheInfo', 'hits, misses, maxsize, currsize')
+# marker for trailing slash
+_SLASH = object()
+
 
 class Rule:
 
@@ -96,6 +100,9 @@ class Rule:
         self._segs = []
         self._convs = {}
         self._vars = set()
+        self._keys = None
+        self._template = ()
+        self._tail = ''
 
     @property
     def map(self):
@@ -153,6 +160,31 @@ class Rule:
 
         self._regex = re.compile(''.join(buf))
 
+        # builder
+        self._template = []
+        static = []
+        for dyn, var in self._segs:
+            if dyn:
+                self._template.append((''.join(static), var, self._convs[var]))
+                static = []
+            else:
+                static.append(var)
+        self._tail = ''.join(static)
+
+        # first segments for dispatching
+        prefix = []
+        for dyn, var in self._segs:
+            if dyn:
+                break
+            prefix.append(var)
+        prefix = ''.join(prefix)
+        if not self._vars:
+            self._keys = frozenset((_first_segment(path), _first_segment(path + '/')))
+        elif prefix.find('/', 1) > 0:
+            self._keys = frozenset((_first_segment(prefix),))
+        else:
+            self._keys = None
+
     def _parse(self, path):
         pos = 0
         for m in _rule_re.finditer(path):
@@ -246,37 +278,46 @@ class Rule:
 
     def build(self, values, anchor=None, method=None, query=True):
         assert self.map is not None, 'rule not bound to map'
-        if not (method is None
-                or method in self.methods):
+        if not self._accepts(values, method):
             return
-        for var in self._vars:
-            if var not in values:
-                return
+        return self._build(values, anchor, query)
+
+    def _accepts(self, values, method):
+        return ((method is None
+                 or method in self.methods)
+                and self._vars.issubset(values))
+
+    def _build(self, values, anchor, query):
         # path
         buf = []
         cache = {}
-        for dyn, var in self._segs:
-            if dyn:
-                cache[var] = util.to_list(values[var])
+        for static, var, conv in self._template:
+            val = values[var]
+            if not isinstance(val, (str, int)):
+                cache[var] = util.to_list(val)
                 if not cache[var]:
                     return
                 val = cache[var].pop(0)
-                try:
-                    buf.append(self._convs[var].to_uri(val))
-                except ValueError:
-                    return
-            else:
-                buf.append(var)
+            try:
+                buf.append(static)
+                buf.append(conv.to_uri(val))
+            except ValueError:
+                return
+        buf.append(self._tail)
         # query
         if query:
             query = []
             for var, val in values.items():
-                val = [util.to_bytes(v, self.map.encoding)
-                       for v in (cache[var] if var in cache else util.to_list(val))]
+                if var in self._convs:
+                    if var not in cache:
+                        continue
+                    val = cache[var]
+                else:
+                    val = util.to_list(val)
                 if not val:
                     continue
-                var = util.to_bytes(var, self.map.encoding)
-                query.append((var, val))
+                query.append((util.to_bytes(var, self.map.encoding),
+                              [util.to_bytes(v, self.map.encoding) for v in val]))
             if query:
                 query = sorted(query, key=self.map.sort_key)
                 buf.append('?')
@@ -291,7 +332,7 @@ class Rule:
 class Map:
 
     def __init__(self, encoding='utf-8', slash=True, converters=None,
-                 sort_key=None):
+                 sort_key=None, cache=None):
         self.encoding = encoding
         self.slash = slash
         self.converters = {
@@ -306,11 +347,32 @@ class Map:
 
         self._rules = []
         self._ref = collections.defaultdict(list)
+        self._index = _Index()
+        self._methods = {}
+        self._slashes = _Index()
+        self._cache = util.LRUCache(cache) if cache else None
+        self._hits = self._misses = 0
+        self._builders = util.LRUCache(1024)
 
     def add(self, rule):
         rule.bind(self)
         self._rules.append(rule)
         self._ref[rule.object].append(rule)
+        # index by first segment
+        self._index.add(rule)
+        # index by method
+        for m in rule.methods:
+            if m not in self._methods:
+                self._methods[m] = self._slashes.copy()
+            self._methods[m].add(rule)
+        if not rule.is_leaf():
+            # may redirect any method
+            self._slashes.add(rule)
+            for m, index in self._methods.items():
+                if m not in rule.methods:
+                    index.add(rule)
+        self.cache_clear()
+        self._builders.clear()
 
     def connect(self, path, object, methods=None):
         self.add(Rule(path, object, methods))
@@ -324,6 +386,16 @@ class Map:
     def bind(self, environ):
         return Router(self, environ)
 
+    def cache_info(self):
+        if self._cache is None:
+            return _CacheInfo(0, 0, 0, 0)
+        return _CacheInfo(self._hits, self._misses, self._cache.cap, len(self._cache))
+
+    def cache_clear(self):
+        if self._cache is not None:
+            self._cache.clear()
+        self._hits = self._misses = 0
+
 
 class _Submap:
 
@@ -350,43 +422,72 @@ class Router:
     def match(self, as_rule=False):
         path = self.environ['PATH_INFO']
         method = self.environ['REQUEST_METHOD']
-        allow = set()
-        for rule in self.map._rules:
+        cache = self.map._cache
+        if cache is None:
+            rule, values = self._match(path, method)
+        else:
+            key = (method, path)
+            try:
+                rule, values = cache[key]
+            except KeyError:
+                self.map._misses += 1
+                rule, values = cache[key] = self._match(path, method)
+            else:
+                self.map._hits += 1
+            if isinstance(values, dict):
+                values = values.copy()
+
+        if rule is _SLASH:
+            environ = self.environ.copy()
+            environ['PATH_INFO'] += '/'
+            raise http.MovedPermanently(uri.request_uri(environ, True))
+        elif rule is None:
+            if values:
+                raise http.NotImplemented(method, uri.request_path(self.environ))
+            raise http.NotFound(uri.request_path(self.environ))
+        elif rule.has_redirect():
+            if isinstance(rule.object, str):
+                def repl(m):
+                    var = m.group(1)
+                    conv = rule._convs[var]
+                    return conv.to_uri(values[var])
+
+                location = _simple_rule_re.sub(repl, rule.object)
+            else:
+                location = rule.object(**values)
+            environ = self.environ | {'PATH_INFO': location}
+            raise http.MovedPermanently(uri.request_uri(environ, True))
+        return rule if as_rule else rule.object, values
+
+    def _match(self, path, method):
+        key = _first_segment(path)
+        for rule in self.map._methods.get(method, self.map._slashes).get(key):
             try:
                 values = rule.match(path)
             except _RequestSlash:
-                environ = self.environ.copy()
-                environ['PATH_INFO'] += '/'
-                raise http.MovedPermanently(uri.request_uri(environ, True))
-            if values is None:
-                continue
-            elif method not in rule.methods:
-                allow.update(rule.methods)
-                continue
-            elif rule.has_redirect():
-                if isinstance(rule.object, str):
-                    def repl(m):
-                        var = m.group(1)
-                        conv = rule._convs[var]
-                        return conv.to_uri(values[var])
-
-                    location = _simple_rule_re.sub(repl, rule.object)
-                else:
-                    location = rule.object(**values)
-                environ = self.environ | {'PATH_INFO': location}
-                raise http.MovedPermanently(uri.request_uri(environ, True))
-            return rule if as_rule else rule.object, values
-        if allow:
-            raise http.NotImplemented(method, uri.request_path(self.environ))
-        raise http.NotFound(uri.request_path(self.environ))
+                return _SLASH, None
+            if (values is not None
+                and method in rule.methods):
+                return rule, values
+        # check other methods
+        allow = any(method not in rule.methods
+                    and rule.match(path) is not None
+                    for rule in self.map._index.get(key))
+        return None, allow
 
     def build(self, object, values=None, anchor=None, method=None, query=True,
               relative=False):
         if values is None:
             values = {}
 
-        for rule in self.map._ref.get(object, ()):
-            path = rule.build(values, anchor, method, query)
+        # candidates by object and names of values
+        key = (object, frozenset(values), method)
+        rules = self.map._builders.get(key)
+        if rules is None:
+            rules = self.map._builders[key] = tuple(r for r in self.map._ref.get(object, ())
+                                                    if r._accepts(values, method))
+        for rule in rules:
+            path = rule._build(values, anchor, query)
             if path is None:
                 continue
             elif relative:
@@ -395,6 +496,40 @@ class Router:
         raise RouteError('no rule for building URI')
 
 
+class _Index:
+
+    __slots__ = ('rules', 'wildcards')
+
+    def __init__(self):
+        self.rules = {}
+        self.wildcards = []
+
+    def add(self, rule):
+        if rule._keys is None:
+            self.wildcards.append(rule)
+            for rules in self.rules.values():
+                rules.append(rule)
+        else:
+            for k in rule._keys:
+                if k not in self.rules:
+                    self.rules[k] = self.wildcards.copy()
+                self.rules[k].append(rule)
+
+    def get(self, key):
+        return self.rules.get(key, self.wildcards)
+
+    def copy(self):
+        index = self.__class__()
+        index.rules = {k: v.copy() for k, v in self.rules.items()}
+        index.wildcards = self.wildcards.copy()
+        return index
+
+
+def _first_segment(path):
+    i = path.find('/', 1)
+    return path[:i] if i > 0 else path
+
+
 class Converter:
 
     pattern = r'[^/]+'
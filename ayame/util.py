@@ -9,12 +9,15 @@
 import collections.abc
 import hashlib
 import itertools
+import os
+import pickle
 import random
+import tempfile
 import threading
 
 
 __all__ = ['fqon_of', 'to_bytes', 'to_list', 'new_token', 'FilterDict',
-           'RWLock', 'LRUCache', 'LFUCache']
+           'RWLock', 'LRUCache', 'PersistentLRUCache', 'LFUCache']
 
 
 def fqon_of(object):
@@ -79,7 +82,10 @@ class FilterDict(dict):
         return super().__contains__(self.__convert__(item))
 
     def __copy__(self):
-        return self.__class__(self)
+        # keys are already converted
+        d = self.__class__()
+        dict.update(d, self)
+        return d
 
     copy = __copy__
 
@@ -400,6 +406,120 @@ class LRUCache(_Cache):
 collections.abc.MutableMapping.register(LRUCache)
 
 
+class PersistentLRUCache(LRUCache):
+    """An LRU cache which also stores its entries into a directory
+
+    Entries are unpickled from the files in the directory, so it must be
+    trusted and not writable by others.
+    """
+
+    __slots__ = ('_path',)
+
+    def __init__(self, path, cap=-1):
+        self._path = os.path.abspath(path)
+        os.makedirs(self._path, exist_ok=True)
+        super().__init__(cap)
+
+    def __getitem__(self, key):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            pass
+        # load from file
+        path = self._path_for(key)
+        try:
+            with open(path, 'rb') as fp:
+                k, value = pickle.load(fp)
+        except OSError:
+            raise KeyError(key)
+        except Exception:
+            self._remove(path)
+            raise KeyError(key)
+        if k != key:
+            raise KeyError(key)
+        super().__setitem__(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        # save to file
+        try:
+            data = pickle.dumps((key, value), pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self._path)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(data)
+            os.replace(tmp, self._path_for(key))
+        except OSError:
+            self._remove(tmp)
+
+    def __delitem__(self, key):
+        found = self._remove(self._path_for(key))
+        try:
+            super().__delitem__(key)
+        except KeyError:
+            if not found:
+                raise
+
+    def __contains__(self, key):
+        return (super().__contains__(key)
+                or os.path.exists(self._path_for(key)))
+
+    def __copy__(self):
+        with self._lock.read():
+            c = self.__class__(self._path, self._cap)
+            for e in self._iter(reverse=True):
+                LRUCache.__setitem__(c, e.key, e.value)
+            return c
+
+    def __getstate__(self):
+        return (self._path,) + super().__getstate__()
+
+    def __setstate__(self, state):
+        self._path = state[0]
+        self._cap = state[1]
+        self.on_init()
+        for k, v in reversed(state[2]):
+            LRUCache.__setitem__(self, k, v)
+
+    copy = __copy__
+
+    def pop(self, key, *args):
+        try:
+            value = self[key]
+        except KeyError:
+            if args:
+                return args[0]
+            raise
+        del self[key]
+        return value
+
+    def clear(self):
+        with self._lock.write():
+            with os.scandir(self._path) as it:
+                for de in it:
+                    if de.is_file():
+                        self._remove(de.path)
+            self._ref.clear()
+            self._head = None
+
+    def on_evicted(self, key, value):
+        super().on_evicted(key, value)
+        self._remove(self._path_for(key))
+
+    def _path_for(self, key):
+        return os.path.join(self._path, hashlib.sha1(repr(key).encode('utf-8')).hexdigest())
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        return True
+
+
 class LFUCache(_Cache):
     """An implementation of LFU cache algorithm
 
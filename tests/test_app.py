@@ -118,6 +118,38 @@ class AppTestCase(AyameTestCase):
             request.session
         self.assertEqual(request.locale, self.locale)
 
+    def test_request_lazy(self):
+        data = self.form_data(('{path}', 'eggs'))
+        environ = self.new_environ(method='POST', form=data)
+        with ayame.Request(environ, {}) as request:
+            request.path = 'ham'
+            self.assertEqual(request.path, 'ham')
+        self.assertEqual(environ['wsgi.input'].tell(), 0)
+
+        request = ayame.Request(environ, {})
+        self.assertEqual(environ['wsgi.input'].tell(), 0)
+        self.assertEqual(request.path, 'eggs')
+        self.assertNotEqual(environ['wsgi.input'].tell(), 0)
+        self.assertIs(request.form_data, request.form_data)
+        request.path = None
+        self.assertIsNone(request.path)
+        request.close()
+
+    def test_request_setters(self):
+        data = self.form_data(('{path}', 'eggs'))
+        environ = self.new_environ(method='POST', form=data, accept='en')
+        with ayame.Request(environ, {}) as request:
+            request.query = {'spam': ['eggs']}
+            self.assertEqual(request.query, {'spam': ['eggs']})
+            request.form_data = {ayame.AYAME_PATH: ['ham']}
+            self.assertEqual(request.form_data, {ayame.AYAME_PATH: ['ham']})
+            self.assertEqual(request.path, 'ham')
+            request.locale = ('ja', 'JP')
+            self.assertEqual(request.locale, ('ja', 'JP'))
+            request.form_data = None
+            self.assertIsNone(request.form_data)
+        self.assertEqual(environ['wsgi.input'].tell(), 0)
+
     def test_request_put(self):
         data = 'spam\neggs\nham\n'
         environ = self.new_environ(method='PUT', data=data)
@@ -196,6 +228,7 @@ class SimpleAppTestCase(AyameTestCase):
         map.connect('/int', 0)
         map.connect('/class', object)
         map.connect('/redir', RedirectPage)
+        map.connect('/broken', BrokenPage)
 
     def new_environ(self, method='GET', path='', query=''):
         return super().new_environ(method=method,
@@ -272,6 +305,16 @@ class SimpleAppTestCase(AyameTestCase):
         self.assertIsNotNone(exc_info)
         self.assertEqual(content, [])
 
+    def test_get_broken_streaming(self):
+        # GET /broken -> InternalServerError
+        self.app.config['ayame.markup.streaming'] = True
+        environ = self.new_environ('GET', '/broken')
+        status, headers, exc_info, content = self.wsgi_call(environ)
+        self.assertEqual(status, http.InternalServerError.status)
+        self.assertEqual(headers, [])
+        self.assertIsNotNone(exc_info)
+        self.assertEqual(content, [])
+
     def test_get_redir_http_301(self):
         # GET /redir?type=permanent -> MovedPermanently
         query = 'type=permanent'
@@ -347,3 +390,11 @@ class RedirectPage(ayame.Page):
             self.redirect(RedirectPage, {'t': 1})
         else:
             self.forward(RedirectPage)
+
+
+class BrokenPage(ayame.Page):
+
+    def on_render(self, element):
+        element = super().on_render(element)
+        element.append(0)
+        return element
@@ -153,6 +153,50 @@ class BasicTestCase(AyameTestCase):
         root.normalize()
         self.assertEqual(root.children, ['[0][1][2]'])
 
+    def test_list_view_skeleton(self):
+        def populate_item(li):
+            li.add(basic.Label('c', li.model.object))
+
+        root = markup.Element(self.of('root'),
+                              attrib={markup.AYAME_ID: 'b'})
+        row = markup.Element(self.of('row'))
+        root.append(row)
+        label = markup.Element(self.of('label'),
+                               attrib={markup.AYAME_ID: 'c'})
+        row.append(label)
+        sep = markup.Element(self.of('sep'))
+        sep.append(markup.Element(self.of('hr')))
+        row.append(sep)
+        mc = ayame.MarkupContainer('a')
+        mc.add(basic.ListView('b', [str(i) for i in range(3)], populate_item))
+
+        root = mc.render(root)
+        self.assertEqual(root.qname, self.of('root'))
+        self.assertEqual(root.attrib, {})
+        self.assertEqual(len(root), 3)
+        for i, row in enumerate(root):
+            self.assertEqual(row.qname, self.of('row'))
+            self.assertIsNone(row.static)
+            self.assertEqual(len(row), 2)
+
+            label = row[0]
+            self.assertEqual(label.qname, self.of('label'))
+            self.assertEqual(label.attrib, {})
+            self.assertEqual(label.children, [str(i)])
+            self.assertIsNone(label.static)
+
+            sep = row[1]
+            self.assertEqual(sep.qname, self.of('sep'))
+            self.assertEqual(sep[0].qname, self.of('hr'))
+        # rows do not share nodes
+        self.assertIsNot(root[0], root[1])
+        self.assertIsNot(root[0][0], root[1][0])
+        self.assertIsNot(root[0][1], root[1][1])
+        self.assertIsNot(root[0][1][0], root[1][1][0])
+        root[0][1][0].qname = self.of('br')
+        self.assertEqual(root[1][1][0].qname, self.of('hr'))
+        self.assertEqual(root[2][1][0].qname, self.of('hr'))
+
     def test_property_list_view(self):
         def populate_item(li):
             li.add(basic.Label('c', li.model.object))
@@ -226,6 +270,90 @@ class BasicTestCase(AyameTestCase):
         root.normalize()
         self.assertEqual(root.children, ['[0][1][2]'])
 
+    def test_list_data_provider(self):
+        p = basic.ListDataProvider([str(i) for i in range(5)])
+        self.assertEqual(p.size(), 5)
+        self.assertEqual(list(p.iterator(0, 2)), ['0', '1'])
+        self.assertEqual(list(p.iterator(3, 5)), ['3', '4'])
+        self.assertEqual(list(p.iterator(5, 1)), [])
+        self.assertEqual(p.model('0').object, '0')
+
+    def test_data_view(self):
+        class DataProvider(basic.ListDataProvider):
+            def iterator(self, offset, count):
+                calls.append((offset, count))
+                return super().iterator(offset, count)
+
+        def populate_item(di):
+            di.add(basic.Label('c', di.model.object))
+
+        for query, current_page, calls_, items in (
+            ('', 0, [(0, 3)], ['0', '1', '2']),
+            ('a:b=1', 1, [(3, 3)], ['3', '4', '5']),
+            ('a:b=3', 3, [(9, 1)], ['9']),
+            ('a:b=4', 3, [(9, 1)], ['9']),
+            ('a:b=-1', 0, [(0, 3)], ['0', '1', '2']),
+            ('a:b=x', 0, [(0, 3)], ['0', '1', '2']),
+        ):
+            with self.subTest(query=query):
+                root = markup.Element(self.of('root'),
+                                      attrib={markup.AYAME_ID: 'b'})
+                label = markup.Element(self.of('label'),
+                                       attrib={markup.AYAME_ID: 'c'})
+                root.append(label)
+                calls = []
+                mc = ayame.MarkupContainer('a')
+                mc.add(basic.DataView('b', DataProvider([str(i) for i in range(10)]), 3, populate_item))
+                with self.application(self.new_environ(query=query)):
+                    root = mc.render(root)
+                self.assertEqual(root.qname, self.of('root'))
+                self.assertEqual(root.attrib, {})
+                self.assertEqual([label.children[0] for label in root], items)
+
+                dv = mc.children[0]
+                self.assertEqual(dv.item_count, 10)
+                self.assertEqual(dv.page_count, 4)
+                self.assertEqual(dv.current_page, current_page)
+                self.assertEqual(calls, calls_)
+                self.assertEqual([di.index for di in dv.children], [int(i) for i in items])
+
+    def test_data_view_empty(self):
+        root = markup.Element(self.of('root'),
+                              attrib={markup.AYAME_ID: 'b'})
+        label = markup.Element(self.of('label'),
+                               attrib={markup.AYAME_ID: 'c'})
+        root.append(label)
+        mc = ayame.MarkupContainer('a')
+        mc.add(basic.DataView('b', basic.ListDataProvider([]), 3))
+        with self.application(self.new_environ()):
+            root = mc.render(root)
+        self.assertEqual(root.qname, self.of('root'))
+        self.assertEqual(root.attrib, {})
+        self.assertEqual(root.children, [])
+
+        dv = mc.children[0]
+        self.assertEqual(dv.page_count, 1)
+        self.assertEqual(dv.current_page, 0)
+
+    def test_data_view_all(self):
+        def populate_item(di):
+            di.add(basic.Label('c', di.model.object))
+
+        root = markup.Element(self.of('root'),
+                              attrib={markup.AYAME_ID: 'b'})
+        label = markup.Element(self.of('label'),
+                               attrib={markup.AYAME_ID: 'c'})
+        root.append(label)
+        mc = ayame.MarkupContainer('a')
+        mc.add(basic.DataView('b', basic.ListDataProvider([str(i) for i in range(3)]), None, populate_item))
+        with self.application(self.new_environ(query='a:b=1')):
+            root = mc.render(root)
+        self.assertEqual([label.children[0] for label in root], ['0', '1', '2'])
+
+        dv = mc.children[0]
+        self.assertEqual(dv.page_count, 1)
+        self.assertEqual(dv.current_page, 0)
+
     def test_context_path_generator(self):
         for path, value in (
             ('/spam', 'eggs.html'),
@@ -6,10 +6,13 @@
 #   SPDX-License-Identifier: MIT
 #
 
+import io
+import os
+import tempfile
 import textwrap
 
 import ayame
-from ayame import basic, http, markup, model
+from ayame import basic, http, markup, model, util
 from base import AyameTestCase
 
 
@@ -52,6 +55,39 @@ class CoreTestCase(AyameTestCase):
         c.visible = False
         self.assertIsNone(c.render(''))
 
+    def test_component_slots(self):
+        c = basic.Label('a')
+        with self.assertRaises(AttributeError):
+            c.__dict__
+        self.assertIsNone(c._behaviors)
+        c.render(markup.Element(None))
+        self.assertIsNone(c._behaviors)
+        self.assertEqual(c.behaviors, [])
+        self.assertIsNotNone(c._behaviors)
+
+        mc = ayame.MarkupContainer('a')
+        with self.assertRaises(AttributeError):
+            mc.__dict__
+        self.assertIsNone(mc._children)
+        self.assertIsNone(mc._ref)
+        self.assertIsNone(mc.find('b'))
+        self.assertEqual(list(mc.walk()), [(mc, 0)])
+        mc.render(markup.Element(self.of('root')))
+        self.assertIsNone(mc._behaviors)
+        self.assertIsNone(mc._children)
+        self.assertIsNone(mc._ref)
+        mc.add(c)
+        self.assertEqual(mc.children, [c])
+        self.assertIs(mc.find('a'), c)
+
+        class Component(ayame.Component):
+            def __init__(self, id):
+                super().__init__(id)
+                self.value = 0
+
+        c = Component('a')
+        self.assertEqual(c.value, 0)
+
     def test_component_with_model(self):
         with self.assertRaisesRegex(ayame.ComponentError, r' not .* instance of Model\b'):
             ayame.Component('1', '')
@@ -109,6 +145,25 @@ class CoreTestCase(AyameTestCase):
         self.assertEqual(c.model_object, '&<>')
         self.assertEqual(c.model_object_as_string(), '&<>')
 
+    def test_path_cache(self):
+        c = ayame.Component('c')
+        self.assertEqual(c.path(), 'c')
+        self.assertIs(c.path(), c.path())
+        mc = ayame.MarkupContainer('b')
+        mc.add(c)
+        self.assertEqual(mc.path(), 'b')
+        self.assertEqual(c.path(), 'b:c')
+        # re-parent
+        root = ayame.MarkupContainer('a')
+        root.add(mc)
+        self.assertEqual(mc.path(), 'a:b')
+        self.assertEqual(c.path(), 'a:b:c')
+        p = ayame.Page()
+        p.add(root)
+        self.assertEqual(root.path(), 'a')
+        self.assertEqual(mc.path(), 'a:b')
+        self.assertEqual(c.path(), 'a:b:c')
+
     def test_markup_container(self):
         mc = ayame.MarkupContainer('a')
         with self.assertRaisesRegex(ayame.ComponentError, r' not attached .*\.Page\b'):
@@ -394,6 +449,43 @@ class CoreTestCase(AyameTestCase):
         self.assertEqual(root.attrib, {})
         self.assertEqual(root.children, ['>', '2', '4', '6', '8', '<'])
 
+    def test_render_order(self):
+        class Component(ayame.Component):
+            def on_render(self, element):
+                order.append(self.id)
+                n = int(self.id)
+                if n % 3 == 0:
+                    return
+                element[:] = [self.id]
+                return [element, self.id] if n % 3 == 1 else element
+
+        order = []
+        root = markup.Element(self.of('root'))
+        mc = ayame.MarkupContainer('a')
+        parent = root
+        for i in range(12):
+            elem = markup.Element(self.of('c'),
+                                  attrib={markup.AYAME_ID: str(i)})
+            parent.extend(('|', elem))
+            mc.add(Component(str(i)))
+            if i % 4 == 3:
+                div = markup.Element(self.of('div'))
+                root.append(div)
+                parent = div
+
+        root = mc.render(root)
+        self.assertEqual(order, [str(i) for i in range(12)])
+        self.assertEqual(self._tree_of(root), [
+            '|', '|', ['1'], '1', '|', ['2'], '|',
+            ['|', ['4'], '4', '|', ['5'], '|', '|', ['7'], '7'],
+            ['|', ['8'], '|', '|', ['10'], '10', '|', ['11']],
+            [],
+        ])
+
+    def _tree_of(self, elem):
+        return [self._tree_of(n) if isinstance(n, markup.Element) else n
+                for n in elem]
+
     def test_render_ayame_container_no_ayame_id(self):
         root = markup.Element(self.of('root'))
         container = markup.Element(markup.AYAME_CONTAINER)
@@ -577,6 +669,47 @@ class CoreTestCase(AyameTestCase):
         ])
         self.assertEqual(content, [html])
 
+    def test_render_ayame_message_no_helper(self):
+        for accept, message, attr in (
+            ('en', 'Hello World!', 'Submit'),
+            ('ja, en', '\u3053\u3093\u306b\u3061\u306f\u4e16\u754c', '\u9001\u4fe1'),
+        ):
+            with self.subTest(accept=accept):
+                with self.application(self.new_environ(accept=accept)):
+                    p = BeansPage()
+                    status, headers, content = p()
+                    self.assertEqual(content, [self.format(BeansPage, message=message)])
+                    self.assertEqual(p.children, [])
+
+                    p = BaconPage()
+                    status, headers, content = p()
+                    self.assertEqual(content, [self.format(BaconPage, message=attr)])
+                    self.assertEqual(p.children, [])
+
+    def test_render_ayame_message_modified_bundle(self):
+        class Leek(ayame.MarkupContainer):
+            pass
+
+        def render(value, mtime):
+            with open(path, 'w', encoding='utf-8') as fp:
+                fp.write(f'message = {value}\n')
+            os.utime(path, (mtime, mtime))
+            with self.application(self.new_environ(accept='en')):
+                message = markup.Element(markup.AYAME_MESSAGE,
+                                         attrib={markup.AYAME_KEY: 'message'})
+                return Leek('a').render(message)
+
+        path = self.path_for('Leek.properties')
+        try:
+            self.assertEqual(render('spam', 1000), ['spam'])
+            self.assertEqual(render('eggs', 2000), ['eggs'])
+            # rolled back
+            self.assertEqual(render('ham', 1000), ['ham'])
+            # modified within the same mtime
+            self.assertEqual(render('toast', 1000), ['toast'])
+        finally:
+            os.remove(path)
+
     def test_render_ayame_message_attribute_invalid_value(self):
         with self.application(self.new_environ()):
             root = markup.Element(self.of('root'),
@@ -666,6 +799,108 @@ class CoreTestCase(AyameTestCase):
         self.assertEqual(a.attrib, {})
         self.assertEqual(a.children, [])
 
+    def test_merge_head(self):
+        def meta(name):
+            return markup.Element(self.html_of('meta'),
+                                  attrib={self.html_of('name'): name},
+                                  type=markup.Element.EMPTY)
+
+        def style(text):
+            e = markup.Element(self.html_of('style'),
+                               attrib={self.html_of('type'): 'text/css'})
+            e.append(text)
+            return e
+
+        def merge(aggregate):
+            self.app.config['ayame.markup.head.aggregate'] = aggregate
+            mc = ayame.MarkupContainer('a')
+            mc.head = markup.Element(markup.HEAD)
+            s = style('p {}')
+            for class_, nodes in ((ayame.MarkupContainer, ['\n', meta('a'), '\n', s]),
+                                  (ayame.MarkupContainer, ['\n', meta('a'), '\n', style('p {}')]),
+                                  (ayame.Component, ['\n', meta('a'), '\n', meta('b')]),
+                                  (ayame.Component, ['\n', style('a {}')])):
+                mc._merge_head(class_, nodes)
+            self.assertEqual(s.children, ['p {}'])
+            return mc.head
+
+        config = self.app.config.copy()
+        try:
+            with self.application():
+                head = merge(False)
+                self.assertEqual(len(head), 10)
+                self.assertEqual([n.attrib for n in head if isinstance(n, markup.Element)], [
+                    {self.html_of('name'): 'a'},
+                    {self.html_of('type'): 'text/css'},
+                    {self.html_of('name'): 'a'},
+                    {self.html_of('name'): 'b'},
+                    {self.html_of('type'): 'text/css'},
+                ])
+                self.assertEqual(head[3].children, ['p {}'])
+                self.assertEqual(head[9].children, ['a {}'])
+
+                head = merge(True)
+                self.assertEqual(len(head), 8)
+                self.assertEqual(head[3].children, ['p {}', '\n', 'a {}'])
+                self.assertEqual(head[5].attrib, {self.html_of('name'): 'a'})
+                self.assertEqual(head[7].attrib, {self.html_of('name'): 'b'})
+        finally:
+            self.app.config = config
+
+    def test_render_modified_static_subtree(self):
+        class Lobster(ayame.MarkupContainer):
+            def __init__(self, id):
+                super().__init__(id)
+                self.has_markup = True
+                self.add(ayame.MarkupContainer('b'))
+
+            def _shared_markup(self):
+                return orig
+
+            def on_render(self, element):
+                element = super().on_render(element)
+                element[0][0][:] = [value]
+                return element
+
+        def render():
+            with self.application():
+                mc = Lobster('a')
+                m = mc.load_markup()
+                m.root = mc.render(m.root)
+                return markup.MarkupRenderer().render(None, m)
+
+        src = io.StringIO('<?xml version="1.0"?>'
+                          '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ayame="http://hattya.github.io/ayame">'
+                          '<body><p>spam</p><div ayame:id="b"><p>spam</p></div></body>'
+                          '</html>')
+        orig = markup.MarkupLoader().load(self, src)
+        self.assertIsNotNone(orig.root[0][0].static)
+        for value in ('eggs', 'ham'):
+            self.assertIn(f'<p>{value}</p><div><p>spam</p></div>'.encode(), render())
+            self.assertEqual(orig.root[0][0].children, ['spam'])
+            self.assertEqual(orig.root[0][0].static, {})
+        # element
+        with self.application():
+            mc = Lobster('a')
+            elem = mc.find('b').element()
+            elem[0][:] = ['eggs']
+            self.assertEqual(mc.find('b').element()[0].children, ['spam'])
+        self.assertEqual(orig.root[0][1][0].children, ['spam'])
+
+    def test_render_modified_descendant(self):
+        for query, user in (
+            ('user=alice', 'alice'),
+            ('user=bob', 'bob'),
+            ('', '?'),
+        ):
+            with self.subTest(user=user):
+                with self.application(self.new_environ(query=query)):
+                    p = LeekPage()
+                    status, headers, content = p()
+                html = self.format(LeekPage, user=user)
+                self.assertEqual(status, http.OK.status)
+                self.assertEqual(content, [html])
+
     def test_render_invisible_child(self):
         root = markup.Element(self.of('root'))
         a = markup.Element(self.of('a'))
@@ -1302,6 +1537,99 @@ class CoreTestCase(AyameTestCase):
         self.assertIsNone(mc.render(None))
         self.assertEqual(mc.model_object, ['before-render', 'component', 'after-render'])
 
+    def test_lifecycle_hooks(self):
+        class Component(ayame.Component):
+            def on_configure(self):
+                super().on_configure()
+                calls.append(('on_configure', self.path()))
+
+            def on_after_render(self):
+                super().on_after_render()
+                calls.append(('on_after_render', self.path()))
+
+        class Behavior(ayame.Behavior):
+            def on_before_render(self, component):
+                calls.append(('on_before_render', component.path()))
+
+        def render():
+            calls.clear()
+            mc.on_configure()
+            mc.on_before_render()
+            mc.on_after_render()
+            return calls
+
+        calls = []
+        mc = ayame.MarkupContainer('a')
+        mc.add(ayame.MarkupContainer('b'))
+        mc.find('b').add(ayame.Component('c'))
+        mc.add(ayame.MarkupContainer('d'))
+        mc.find('d').add(Component('e'))
+        mc.add(Component('f'))
+        self.assertEqual(render(), [
+            ('on_configure', 'a:d:e'),
+            ('on_configure', 'a:f'),
+            ('on_after_render', 'a:d:e'),
+            ('on_after_render', 'a:f'),
+        ])
+        self.assertEqual(mc._collect_hooks(), {'on_configure', 'on_after_render'})
+        self.assertEqual(mc.find('b')._collect_hooks(), set())
+        self.assertEqual(mc.find('d')._collect_hooks(), {'on_configure', 'on_after_render'})
+        # getters
+        hooks = mc._subtree_hooks
+        mc.find('d').children
+        mc.find('d:e').behaviors
+        self.assertIs(mc._subtree_hooks, hooks)
+        self.assertIsNotNone(mc.find('d')._subtree_hooks)
+        # add behavior
+        mc.find('b:c').add(Behavior())
+        self.assertIsNone(mc._subtree_hooks)
+        self.assertIsNone(mc.find('b')._subtree_hooks)
+        self.assertEqual(render(), [
+            ('on_configure', 'a:d:e'),
+            ('on_configure', 'a:f'),
+            ('on_before_render', 'a:b:c'),
+            ('on_after_render', 'a:d:e'),
+            ('on_after_render', 'a:f'),
+        ])
+        # invisible
+        mc.find('b').visible = False
+        mc.find('d:e').visible = False
+        self.assertEqual(render(), [
+            ('on_configure', 'a:d:e'),
+            ('on_configure', 'a:f'),
+            ('on_after_render', 'a:f'),
+        ])
+        # add component
+        mc.find('b').visible = True
+        mc.find('b').add(ayame.MarkupContainer('g'))
+        self.assertEqual(render(), [
+            ('on_configure', 'a:d:e'),
+            ('on_configure', 'a:f'),
+            ('on_before_render', 'a:b:c'),
+            ('on_after_render', 'a:f'),
+        ])
+        mc.find('b:g').add(Component('h'))
+        self.assertIsNone(mc._subtree_hooks)
+        self.assertEqual(render(), [
+            ('on_configure', 'a:b:g:h'),
+            ('on_configure', 'a:d:e'),
+            ('on_configure', 'a:f'),
+            ('on_before_render', 'a:b:c'),
+            ('on_after_render', 'a:b:g:h'),
+            ('on_after_render', 'a:f'),
+        ])
+
+    def test_cacheable_on_render(self):
+        class Leek(ayame.Cacheable, ayame.MarkupContainer):
+            pass
+
+        with self.application(self.new_environ()):
+            mc = Leek('a')
+            root = mc.on_render(markup.Element(self.of('root')))
+            mc.on_after_render()
+        self.assertEqual(root.qname, self.of('root'))
+        self.assertEqual(root.children, [])
+
     def test_attribute_modifier_on_component(self):
         root = markup.Element(self.of('root'),
                               attrib={self.of('a'): ''})
@@ -1355,6 +1683,27 @@ class CoreTestCase(AyameTestCase):
         ])
         self.assertEqual(content, [html])
 
+    def test_fire_get_streaming(self):
+        query = '{path}=clay1'
+        self.app.config['ayame.markup.streaming'] = True
+        try:
+            with self.application(self.new_environ(query=query)):
+                p = EggsPage()
+                status, headers, content = p()
+                self.assertEqual(p.model_object, {
+                    'clay1': 1,
+                    'clay2': 0,
+                })
+                content = list(content)
+        finally:
+            self.app.config['ayame.markup.streaming'] = False
+        html = self.format(EggsPage)
+        self.assertEqual(status, http.OK.status)
+        self.assertEqual(headers, [
+            ('Content-Type', 'text/html; charset=UTF-8'),
+        ])
+        self.assertEqual(b''.join(content), html)
+
     def test_fire_get_duplicate_ayame_path(self):
         query = ('{path}=clay1&'
                  '{path}=obstacle:clay2')
@@ -1596,6 +1945,17 @@ class CoreTestCase(AyameTestCase):
             p = EggsPage()
             self.assertIsInstance(p.find('clay1').element(), markup.Element)
             self.assertIsInstance(p.find('obstacle:clay2').element(), markup.Element)
+            self.assertEqual(p.find('obstacle:clay2').element().attrib, {markup.AYAME_ID: 'clay2'})
+            self.assertIsNot(p.find('obstacle').element(), p.find('obstacle').element())
+            # without index
+            m = EggsPage().load_markup()
+            m.ids = None
+            p._shared_markup = lambda: m
+            self.assertEqual(p.find('obstacle:clay2').element().attrib, {markup.AYAME_ID: 'clay2'})
+            elem = p.find('obstacle:clay2').element()
+            elem.attrib['spam'] = 'eggs'
+            self.assertIsNot(elem, p.find('obstacle:clay2').element())
+            self.assertNotIn('spam', p.find('obstacle:clay2').element().attrib)
 
     def test_cache(self):
         config = self.app.config.copy()
@@ -1622,6 +1982,120 @@ class CoreTestCase(AyameTestCase):
         finally:
             self.app.config = config
 
+    def test_cache_fork(self):
+        config = self.app.config.copy()
+        try:
+            self.app.config['ayame.markup.cache'] = cache = config['ayame.markup.cache'].copy()
+
+            with self.application(self.new_environ()):
+                p = EggsPage()
+                p()
+            self.assertEqual(len(cache), 1)
+            _, m = next(iter(cache.values()))
+            orig = m.copy()
+
+            for pretty in (False, True, False):
+                self.app.config['ayame.markup.pretty'] = pretty
+                with self.application(self.new_environ()):
+                    p = EggsPage()
+                    p()
+                self.assertEqual(len(cache), 1)
+                self.assertElementEqual(m.root, orig.root)
+        finally:
+            self.app.config = config
+
+    def test_cache_merged(self):
+        class Spam(ayame.MarkupContainer):
+            pass
+
+        class Sausage(Spam):
+            pass
+
+        config = self.app.config.copy()
+        try:
+            self.app.config['ayame.markup.cache'] = cache = config['ayame.markup.cache'].copy()
+
+            with self.application():
+                mc = Sausage('a')
+                m = mc.load_markup()
+            self.assertEqual(len(cache), 3)
+            key = f'{__name__}:Sausage.html:merged'
+            spam_key = f'{__name__}:Spam.html'
+            self.assertIn(key, cache)
+            chain, merged = cache[key]
+            self.assertEqual([k for k, _ in chain], [f'{__name__}:Sausage.html', spam_key])
+            self.assertIsNot(m, merged)
+            self.assertIsNot(m.root, merged.root)
+            # cached
+            with self.application():
+                mc = Sausage('a')
+                self.assertMarkupEqual(mc.load_markup(), m)
+            self.assertIs(cache[key][1], merged)
+            # modified within the same mtime
+            mtime, size = chain[1][1]
+            cache[key] = (chain[:1] + ((spam_key, (mtime, size + 1)),), merged)
+            with self.application():
+                mc = Sausage('a')
+                self.assertMarkupEqual(mc.load_markup(), m)
+            self.assertEqual(len(cache), 3)
+            self.assertIsNot(cache[key][1], merged)
+            # rolled back
+            merged = cache[key][1]
+            stamp, spam = cache[spam_key]
+            stamp = (stamp[0] + 60, stamp[1])
+            cache[spam_key] = (stamp, spam)
+            cache[key] = (chain[:1] + ((spam_key, stamp),), merged)
+            with self.application():
+                mc = Sausage('a')
+                self.assertMarkupEqual(mc.load_markup(), m)
+            self.assertIsNot(cache[spam_key][1], spam)
+            self.assertIsNot(cache[key][1], merged)
+            # superclass
+            class Bacon(ayame.MarkupContainer):
+                pass
+
+            class Sausage(Bacon):
+                pass
+
+            with self.application():
+                mc = Sausage('a')
+                mc.load_markup()
+            self.assertEqual([k for k, _ in cache[key][0]], [f'{__name__}:Sausage.html', f'{__name__}:Bacon.html'])
+        finally:
+            self.app.config = config
+
+    def test_cache_persistent(self):
+        class MarkupLoader(markup.MarkupLoader):
+            def load(self, *args, **kwargs):
+                raise AssertionError
+
+        config = self.app.config.copy()
+        try:
+            with tempfile.TemporaryDirectory(prefix='ayame-') as tmp:
+                self.app.config['ayame.markup.cache'] = util.PersistentLRUCache(tmp)
+
+                with self.application(self.new_environ()):
+                    p = EggsPage()
+                    _, _, content = p()
+                self.assertEqual(len(os.listdir(tmp)), 1)
+                # new process
+                self.app.config['ayame.markup.cache'] = cache = util.PersistentLRUCache(tmp)
+                self.app.config['ayame.markup.loader'] = MarkupLoader
+                self.assertEqual(len(cache), 0)
+
+                with self.application(self.new_environ()):
+                    p = EggsPage()
+                    self.assertEqual(p()[2], content)
+                self.assertEqual(len(cache), 1)
+        finally:
+            self.app.config = config
+
+    def assertMarkupEqual(self, a, b):
+        self.assertEqual(a.xml_decl, b.xml_decl)
+        self.assertEqual(a.lang, b.lang)
+        self.assertEqual(a.doctype, b.doctype)
+        self.assertEqual(markup.MarkupRenderer().render(self, a), markup.MarkupRenderer().render(self, b))
+
 
 class Component(ayame.Component):
 
@@ -1716,3 +2190,36 @@ class BaconPage(ayame.Page):
           </body>
         </html>
     """)
+
+
+class LeekPage(ayame.Page):
+
+    html_t = textwrap.dedent("""\
+        <?xml version="1.0"?>
+        {doctype}
+        <html xmlns="{xhtml}">
+          <head>
+            <title>LeekPage</title>
+          </head>
+          <body>
+            <div>
+              <p>{user}</p>
+            </div>
+          </body>
+        </html>
+    """)
+
+    def __init__(self):
+        super().__init__()
+        self.add(UserContainer('user'))
+
+
+class UserContainer(ayame.MarkupContainer):
+
+    def on_render(self, element):
+        element = super().on_render(element)
+        if 'user' in self.request.query:
+            for node in element:
+                if isinstance(node, markup.Element):
+                    node[:] = [self.request.query['user'][0]]
+        return element
@@ -307,6 +307,25 @@ class FormTestCase(AyameTestCase):
         with self.assertRaisesRegex(ayame.ComponentError, r' is not attached .*\.Form\b'):
             form.FormComponent('a').relative_path()
 
+    def test_form_component_relative_path_cache(self):
+        fc = form.FormComponent('c')
+        mc = ayame.MarkupContainer('b')
+        mc.add(fc)
+        f = form.Form('a')
+        f.add(mc)
+        self.assertEqual(fc.relative_path(), 'b:c')
+        self.assertEqual(fc.path(), 'a:b:c')
+        # re-parent
+        mc = ayame.MarkupContainer('x')
+        mc.add(f)
+        self.assertEqual(fc.relative_path(), 'b:c')
+        self.assertEqual(fc.path(), 'x:a:b:c')
+        f = form.Form('y')
+        f.add(mc)
+        self.assertEqual(fc.relative_path(), 'b:c')
+        self.assertEqual(fc.path(), 'y:x:a:b:c')
+        self.assertEqual(f.find('x').path(), 'y:x')
+
     def test_form_component_required_error(self):
         with self.application(self.new_environ()):
             fc = form.FormComponent('a')
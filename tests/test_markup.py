@@ -58,6 +58,25 @@ class MarkupTestCase(AyameTestCase):
         m = self.new_xhtml1()
         self.assertMarkupEqual(m, m.copy())
 
+    def test_markup_fork(self):
+        m = self.new_xhtml1()
+        m.root[0].static = {}
+        m.root[0][0].static = {}
+        f = m.fork()
+        self.assertIsNot(f, m)
+        self.assertIsNot(f.xml_decl, m.xml_decl)
+        self.assertEqual(f.xml_decl, m.xml_decl)
+        self.assertEqual(f.lang, m.lang)
+        self.assertEqual(f.doctype, m.doctype)
+        # html
+        self.assertIsNot(f.root, m.root)
+        self.assertIsNot(f.root.children, m.root.children)
+        self.assertEqual(f.root.ns, m.root.ns)
+        # html head
+        self.assertIs(f.root[0], m.root[0])
+        # html body
+        self.assertElementEqual(f.root[1], m.root[1])
+
     def test_markup_pickle(self):
         m = self.new_xhtml1()
         self.assertMarkupEqual(m, pickle.loads(pickle.dumps(m)))
@@ -158,8 +177,10 @@ class MarkupTestCase(AyameTestCase):
 
 class MarkupLoaderTestCase(AyameTestCase):
 
+    loader = markup.MarkupLoader
+
     def assertError(self, src, pos, regex, **kwargs):
-        loader = kwargs.pop('loader', markup.MarkupLoader)()
+        loader = kwargs.pop('loader', self.loader)()
         with self.assertRaises(ayame.MarkupError) as cm:
             loader.load(self, src, **kwargs)
         self.assertEqual(len(cm.exception.args), 3)
@@ -168,7 +189,7 @@ class MarkupLoaderTestCase(AyameTestCase):
         self.assertRegex(cm.exception.args[2], regex)
 
     def load(self, src, **kwargs):
-        return markup.MarkupLoader().load(self, src, **kwargs)
+        return self.loader().load(self, src, **kwargs)
 
     def format(self, doc_t, *args, **kwargs):
         kwargs.update(doctype=markup.XHTML1_STRICT,
@@ -312,7 +333,7 @@ class MarkupLoaderTestCase(AyameTestCase):
         self.assertEqual(eggs.children, [])
 
         # no default namespace
-        class Loader(markup.MarkupLoader):
+        class Loader(self.loader):
             def _new_element(self, *args, **kwargs):
                 elem = super()._new_element(*args, **kwargs)
                 elem.ns.pop('', None)
@@ -322,7 +343,7 @@ class MarkupLoaderTestCase(AyameTestCase):
         self.assertError(src, (1, 70), r' no default namespace$', lang='xml', loader=Loader)
 
         # no eggs namespace
-        class Loader(markup.MarkupLoader):
+        class Loader(self.loader):
             def _new_element(self, *args, **kwargs):
                 elem = super()._new_element(*args, **kwargs)
                 elem.ns.pop('eggs', None)
@@ -500,6 +521,123 @@ class MarkupLoaderTestCase(AyameTestCase):
         })
         self.assertEqual(html.children, [])
 
+    def test_static(self):
+        html = self.format(
+            '<?xml version="1.0"?>'
+            '{doctype}'
+            '<html xmlns="{xhtml}" xmlns:ayame="{ayame}">'
+            '<head>'
+            '<title>title</title>'
+            '</head>'
+            '<body>'
+            '<h1>text</h1>'
+            '<p><span ayame:id="span">text</span></p>'
+            '<ayame:container ayame:id="container"><hr /></ayame:container>'
+            '</body>'
+            '</html>'
+        )
+        src = io.StringIO(html)
+        m = self.load(src, lang='xhtml1')
+        self.assertIsNone(m.root.static)
+        # html head
+        head = m.root[0]
+        self.assertEqual(head.static, {})
+        self.assertEqual(head[0].static, {})
+        # html body
+        body = m.root[1]
+        self.assertIsNone(body.static)
+        self.assertEqual(body[0].static, {})
+        self.assertIsNone(body[1].static)
+        self.assertIsNone(body[1][0].static)
+        self.assertIsNone(body[2].static)
+        self.assertEqual(body[2][0].static, {})
+        # copy
+        head = m.copy().root[0]
+        self.assertEqual(head.static, {})
+        self.assertIsNot(head.static, m.root[0].static)
+
+    def test_index(self):
+        html = self.format(
+            '<?xml version="1.0"?>'
+            '{doctype}'
+            '<html xmlns="{xhtml}" xmlns:ayame="{ayame}">'
+            '<body>'
+            '<form ayame:id="a">'
+            '<p><input ayame:id="b" /></p>'
+            '<div ayame:id="c"><input ayame:id="b" /></div>'
+            '</form>'
+            '<ayame:remove><p ayame:id="a" /></ayame:remove>'
+            '<p ayame:id="b" />'
+            '</body>'
+            '</html>'
+        )
+        src = io.StringIO(html)
+        m = self.load(src, lang='xhtml1')
+        self.assertEqual(m.ids, {
+            'a': ((0, 0),),
+            'b': ((0, 0, 0, 0), (0, 0, 1, 0), (0, 1)),
+            'c': ((0, 0, 1),),
+        })
+        body = m.root[0]
+        self.assertIs(m.find(()), m.root)
+        self.assertIs(m.find(('a',)), body[0])
+        self.assertIs(m.find(('b',)), body[0][0][0])
+        self.assertIs(m.find(('a', 'b')), body[0][0][0])
+        self.assertIs(m.find(('a', 'c', 'b')), body[0][1][0])
+        self.assertIs(m.find(('c', 'c')), body[0][1])
+        self.assertIsNone(m.find(('c', 'a')))
+        self.assertIsNone(m.find(('d',)))
+        # copy
+        self.assertIsNone(m.copy().ids)
+        self.assertIsNone(m.fork().ids)
+        self.assertEqual(pickle.loads(pickle.dumps(m)).ids, m.ids)
+
+
+class FastMarkupLoaderTestCase(MarkupLoaderTestCase):
+
+    loader = markup.FastMarkupLoader
+
+    def assertLoad(self, xml):
+        a = markup.MarkupLoader().load(self, io.StringIO(xml), lang='xml')
+        b = self.load(io.StringIO(xml), lang='xml')
+        self.assertEqual(a.xml_decl, b.xml_decl)
+        self.assertEqual(a.lang, b.lang)
+        self.assertEqual(a.doctype, b.doctype)
+        self.assertEqual(markup.MarkupRenderer().render(self, a), markup.MarkupRenderer().render(self, b))
+        return b
+
+    def test_cdata(self):
+        m = self.assertLoad(textwrap.dedent("""\
+            <?xml version="1.0"?>
+            <spam>
+              <script>if (a < b && b > c) {}</script>
+              <STYLE>p > a {}</STYLE >
+            </spam>
+        """))
+        self.assertEqual(m.root[1].children, ['if (a < b && b > c) {}'])
+        self.assertEqual(m.root[3].children, ['p > a {}'])
+
+    def test_attributes(self):
+        m = self.assertLoad(textwrap.dedent("""\
+            <?xml version="1.0"?>
+            <spam ID = "a&amp;b" Class='' title="&quot;'">&amp; &#38; &#x26;<!-- -- --></spam>
+        """))
+        self.assertEqual(m.root.attrib, {
+            markup.QName('', 'id'): 'a&b',
+            markup.QName('', 'class'): '',
+            markup.QName('', 'title'): '"\'',
+        })
+        self.assertEqual(m.root.children, ['&amp; &#38; &#x26;'])
+
+    def test_fallback(self):
+        for xml in (
+            '<?xml version="1.0"?><spam>a < b</spam>',
+            '<?xml version="1.0"?><spam>&amp &#38</spam>',
+            '<?xml version="1.0"?><spam id=a><eggs/></spam>',
+            '<?xml version="1.0"?><spam><![CDATA[eggs]]></spam>',
+        ):
+            self.assertLoad(xml)
+
 
 class MarkupRendererTestCase(AyameTestCase):
 
@@ -1038,6 +1176,132 @@ class MarkupRendererTestCase(AyameTestCase):
 
         self.assertEqual(renderer.render(self, m, pretty=True), html)
 
+    def test_render_static(self):
+        renderer = markup.MarkupRenderer()
+        m = self.new_markup('xml')
+        eggs = m.root[0]
+        eggs[:] = ['eggs']
+        eggs.static = {}
+
+        xml = textwrap.dedent("""\
+            <?xml version="1.0" standalone="yes"?>
+            <spam xmlns="spam" id="a"><eggs>eggs</eggs></spam>
+        """).encode()
+        self.assertEqual(renderer.render(self, m), xml)
+        self.assertEqual(list(eggs.static.values()), ['<eggs>eggs</eggs>'])
+        # pre-serialized segment
+        eggs[:] = ['ham']
+        self.assertEqual(renderer.render(self, m), xml)
+        self.assertEqual(renderer.render(self, m, pretty=True), textwrap.dedent("""\
+            <?xml version="1.0" standalone="yes"?>
+            <spam xmlns="spam" id="a">
+              <eggs>ham</eggs>
+            </spam>
+        """).encode())
+        # namespace
+        m.root.ns['eggs'] = 'eggs'
+        self.assertEqual(renderer.render(self, m), xml.replace(b'"spam" id', b'"spam" xmlns:eggs="eggs" id').replace(b'eggs>eggs', b'eggs>ham'))
+        self.assertEqual(len([k for k in eggs.static if isinstance(k, tuple)]), 2)
+
+    def test_prefix_for(self):
+        renderer = markup.MarkupRenderer()
+        renderer.object = self
+        spam = markup.Element(markup.QName('spam', 'spam'),
+                              ns={'': 'spam', 'a': 'a'})
+        eggs = markup.Element(markup.QName('spam', 'eggs'))
+        ham = markup.Element(markup.QName('ham', 'ham'),
+                             ns={'': 'ham'})
+        renderer.push(-1, spam)
+        self.assertEqual(renderer.scope(), ((('', 'spam'), ('a', 'a')),))
+        self.assertEqual(renderer.prefix_for('spam'), '')
+        self.assertEqual(renderer.prefix_for('a'), 'a')
+        # same scope
+        renderer.push(0, eggs)
+        self.assertIs(renderer.peek().prefixes, renderer.at(0).prefixes)
+        self.assertIs(renderer.scope(), renderer.at(0).scope)
+        self.assertEqual(renderer.prefix_for('a'), 'a')
+        # new scope
+        renderer.push(0, ham)
+        self.assertIsNot(renderer.peek().prefixes, renderer.at(0).prefixes)
+        self.assertEqual(renderer.scope(), ((('', 'spam'), ('a', 'a')), (('', 'ham'),)))
+        self.assertEqual(renderer.prefix_for('ham'), '')
+        for _ in range(2):
+            with self.assertRaises(ayame.RenderingError) as cm:
+                renderer.prefix_for('a')
+            self.assertRegex(cm.exception.args[1], r"namespace URI .*''.* overwritten$")
+        renderer.pop()
+        self.assertEqual(renderer.prefix_for('a'), 'a')
+        self.assertEqual(renderer.peek().prefixes, {
+            'spam': '',
+            'a': 'a',
+        })
+
+    def test_render_static_pretty(self):
+        renderer = markup.MarkupRenderer()
+        m = self.new_markup('xml')
+        eggs = m.root[0]
+        eggs[:] = ['\n  eggs  \n']
+        eggs.static = {}
+
+        xml = textwrap.dedent("""\
+            <?xml version="1.0" standalone="yes"?>
+            <spam xmlns="spam" id="a">
+              <eggs>
+                eggs
+              </eggs>
+            </spam>
+        """).encode()
+        for _ in range(2):
+            self.assertEqual(renderer.render(self, m, pretty=True), xml)
+            self.assertEqual(eggs.children, ['\n  eggs  \n'])
+            # compiled element
+            self.assertEqual(list(eggs.static), [markup.XMLHandler])
+            flags, elem = eggs.static[markup.XMLHandler]
+            self.assertIsNot(elem, eggs)
+            self.assertEqual(elem.children, ['eggs'])
+        eggs.static[markup.XMLHandler] = (flags, markup.Element(eggs.qname))
+        self.assertEqual(renderer.render(self, m, pretty=True), xml.replace(b'\n    eggs', b''))
+
+    def test_stream(self):
+        renderer = markup.MarkupRenderer()
+        m = self.new_markup('xml')
+        del m.root[:]
+        for _ in range(3):
+            eggs = markup.Element(markup.QName('spam', 'eggs'))
+            eggs.append('eggs')
+            m.root.append(eggs)
+
+        xml = textwrap.dedent("""\
+            <?xml version="1.0" standalone="yes"?>
+            <spam xmlns="spam" id="a"><eggs>eggs</eggs><eggs>eggs</eggs><eggs>eggs</eggs></spam>
+        """).encode()
+        chunks = list(renderer.stream(self, m))
+        self.assertEqual(chunks, [xml])
+        chunks = list(renderer.stream(self, m, buffer_size=0))
+        self.assertEqual(chunks, [
+            b'<?xml version="1.0" standalone="yes"?>\n<spam xmlns="spam" id="a">',
+            b'<eggs>', b'eggs</eggs>',
+            b'<eggs>', b'eggs</eggs>',
+            b'<eggs>', b'eggs</eggs></spam>',
+            b'\n',
+        ])
+        chunks = list(renderer.stream(self, m, buffer_size=64))
+        self.assertEqual(chunks, [
+            b'<?xml version="1.0" standalone="yes"?>\n<spam xmlns="spam" id="a">',
+            b'<eggs>eggs</eggs><eggs>eggs</eggs><eggs>eggs</eggs></spam>\n',
+        ])
+        # static subtree
+        for eggs in m.root:
+            eggs.static = {}
+        for _ in range(2):
+            chunks = list(renderer.stream(self, m, buffer_size=0))
+            self.assertEqual(chunks[1:], [
+                b'<eggs>eggs</eggs>',
+                b'<eggs>eggs</eggs>',
+                b'<eggs>eggs</eggs></spam>',
+                b'\n',
+            ])
+
 
 class ElementTestCase(AyameTestCase):
 
@@ -1072,6 +1336,18 @@ class ElementTestCase(AyameTestCase):
             (o, 'ham'),
             (self.html_of('id'), 'spam'),
         ])
+        # interned
+        k = self.html_of('ID')
+        self.assertIn(k, div.attrib)
+        self.assertIs(div.attrib.__convert__(k), div.attrib.__convert__(self.html_of('id')))
+        self.assertIs(div.attrib.__convert__('CLASS'), div.attrib.__convert__('Class'))
+        self.assertIs(div.attrib.__convert__(o), o)
+        self.assertEqual(div.attrib.__convert__([]), [])
+        # copy
+        attrib = div.attrib.copy()
+        self.assertIsInstance(attrib, markup._AttributeDict)
+        self.assertEqual(attrib, div.attrib)
+        self.assertIn(k, attrib)
 
     def test_set(self):
         p = self.new_element('p')
@@ -1148,6 +1424,20 @@ class ElementTestCase(AyameTestCase):
         div = self._test_dup(lambda div: div.copy())
         self.assertIsNot(div[1][1], div[3])
 
+    def test_fork(self):
+        div = self._test_dup(lambda div: div.fork())
+        self.assertIsNot(div[1][1], div[3])
+
+        div = self.new_element('div', {'id': 'spam'})
+        p = self.new_element('p', {'id': 'eggs'})
+        p.static = {}
+        div[:] = ['toast', p]
+        div.static = {}
+        elem = div.fork()
+        self.assertIsNone(elem.static)
+        self.assertIsNot(elem.children, div.children)
+        self.assertIs(elem[1], p)
+
     def test_pickle(self):
         div = self._test_dup(lambda div: pickle.loads(pickle.dumps(div)))
         self.assertIs(div[1][1], div[3])
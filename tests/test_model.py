@@ -138,6 +138,92 @@ class ModelTestCase(AyameTestCase):
         self.assertEqual(o['mapping'], 'new_value')
         self.assertEqual(mc.find('mapping').model.object, 'new_value')
 
+    def test_compound_model_wrap(self):
+        m = model.CompoundModel({})
+        a = m.wrap(ayame.Component('a'))
+        b = m.wrap(ayame.Component('b'))
+        self.assertIsInstance(a, model.WrapModel)
+        self.assertIs(a.__class__, b.__class__)
+        self.assertIs(a.wrapped_model, m)
+        self.assertIs(b.wrapped_model, m)
+
+    def test_compound_model_strategy(self):
+        class Object:
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+                self.__method = 'method'
+
+            def get_method(self):
+                return self.__method
+
+            def set_method(self, method):
+                self.__method = method
+
+            def __getitem__(self, key):
+                return 'item'
+
+            def __setitem__(self, key, value):
+                items.append((key, value))
+
+        items = []
+        for kwargs, method, item in (
+            ({}, 'method', 'item'),
+            ({'method': 'attr'}, 'attr', 'item'),
+            ({}, 'method', 'item'),
+            ({'get_item': lambda: 'get_item'}, 'method', 'get_item'),
+            ({}, 'method', 'item'),
+        ):
+            with self.subTest(kwargs=kwargs):
+                o = Object(**kwargs)
+                mc = ayame.MarkupContainer('a', model.CompoundModel(o))
+                mc.add(ayame.Component('method'))
+                mc.add(ayame.Component('item'))
+                self.assertEqual(mc.find('method').model.object, method)
+                self.assertEqual(mc.find('item').model.object, item)
+                self.assertEqual(mc.find('method').model.object, method)
+                self.assertEqual(mc.find('item').model.object, item)
+                self.assertEqual(model._accessors[(Object, 'method', False)], model._METHOD)
+                self.assertEqual(model._accessors[(Object, 'item', False)], model._ITEM)
+
+                items.clear()
+                mc.find('method').model.object = 'new_value'
+                self.assertEqual(mc.find('method').model.object, 'new_value')
+                mc.find('item').model.object = 'new_value'
+                self.assertEqual(items, [('item', 'new_value')])
+
+    def test_compound_model_strategy_fallback(self):
+        for o, v in (
+            ({'key': 'item'}, 'item'),
+            ({}, None),
+            ({'key': 'item'}, 'item'),
+        ):
+            with self.subTest(o=o):
+                mc = ayame.MarkupContainer('a', model.CompoundModel(o))
+                mc.add(ayame.Component('key'))
+                self.assertEqual(mc.find('key').model.object, v)
+
+    def test_compound_model_strategy_slots(self):
+        class Object:
+            __slots__ = ('method',)
+
+            def get_method(self):
+                return 'method'
+
+        for attr, v in (
+            (False, 'method'),
+            (True, 'attr'),
+            (False, 'method'),
+        ):
+            with self.subTest(attr=attr):
+                o = Object()
+                if attr:
+                    o.method = 'attr'
+                mc = ayame.MarkupContainer('a', model.CompoundModel(o))
+                mc.add(ayame.Component('method'))
+                self.assertEqual(mc.find('method').model.object, v)
+                self.assertEqual(mc.find('method').model.object, v)
+                self.assertEqual(model._accessors[(Object, 'method', False)], model._METHOD)
+
     def test_compound_model_replace(self):
         o = {
             'b': 'b',
@@ -7,6 +7,7 @@
 #
 
 import textwrap
+import time
 
 import ayame
 from ayame import basic, form, http, markup, panel
@@ -127,6 +128,101 @@ class PanelTestCase(AyameTestCase):
         self.assertEqual(p.ns, {})
         self.assertEqual(p.children, ['after panel (Spam)'])
 
+    def test_panel_cacheable(self):
+        class Spam(MarkupContainer):
+            def __init__(self, id, key):
+                super().__init__(id)
+                self.add(SpamPanel('panel', key))
+
+        class SpamPanel(ayame.Cacheable, Panel):
+            def __init__(self, id, key):
+                super().__init__(id)
+                self.key = key
+
+            def cache_key(self):
+                return self.key
+
+            def load_markup(self):
+                loaded.append(self.key)
+                return super().load_markup()
+
+        def render(key, ttl=None):
+            with self.application(self.new_environ()):
+                mc = Spam('a', key)
+                mc.find('panel').cache_ttl = ttl
+                m, html = mc.render()
+                self.assertEqual(len(html.children[1]), 8)
+                m.root = html
+                return markup.MarkupRenderer().render(mc, m, pretty=True)
+
+        cache = self.app.config['ayame.render.cache']
+        cache.clear()
+        loaded = []
+        # not cached
+        html = render(None)
+        self.assertEqual(loaded, [None])
+        self.assertEqual(render(None), html)
+        self.assertEqual(loaded, [None] * 2)
+        self.assertEqual(len(cache), 0)
+        # cached
+        loaded = []
+        self.assertEqual(render(1), html)
+        self.assertEqual(loaded, [1])
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(render(1), html)
+        self.assertEqual(render(1), html)
+        self.assertEqual(loaded, [1])
+        self.assertEqual(render(2), html)
+        self.assertEqual(loaded, [1, 2])
+        self.assertEqual(len(cache), 2)
+        # expired
+        loaded = []
+        self.assertEqual(render(3, 0), html)
+        self.assertEqual(render(3, 0), html)
+        self.assertEqual(loaded, [3] * 2)
+        self.assertEqual(render(4, 60), html)
+        self.assertEqual(render(4, 60), html)
+        self.assertEqual(loaded, [3] * 2 + [4])
+        # wall-clock time
+        expires = max(e[0] for e in cache.values() if e[0] is not None)
+        self.assertLess(time.time(), expires)
+        self.assertLessEqual(expires, time.time() + 60)
+        cache.clear()
+
+    def test_panel_head_contributions(self):
+        class Leek(MarkupContainer):
+            def __init__(self, id):
+                super().__init__(id)
+                self.add(SpamPanel('panel1'))
+                self.add(SpamPanel('panel2'))
+
+        class SpamPanel(Panel):
+            pass
+
+        with self.application(self.new_environ()):
+            mc = Leek('a')
+            m, html = mc.render()
+        self.assertEqual(m.xml_decl, {'version': '1.0'})
+        self.assertEqual(m.lang, 'xhtml1')
+        self.assertEqual(m.doctype, markup.XHTML1_STRICT)
+        self.assertTrue(m.root)
+
+        head = html[1]
+        self.assertEqual(head.qname, self.html_of('head'))
+        self.assertEqual(len(head), 8)
+        self.assertEqual([n.attrib[self.html_of('content')] for n in head
+                          if isinstance(n, markup.Element) and n.qname == self.html_of('meta')], ['Leek', 'SpamPanel'])
+
+        body = html[3]
+        self.assertEqual(body.qname, self.html_of('body'))
+        self.assertEqual([n.children for n in body
+                          if isinstance(n, markup.Element)], [
+            ['before panel (Leek)'],
+            ['inside ayame:panel (', 'SpamPanel', ')'],
+            ['inside ayame:panel (', 'SpamPanel', ')'],
+            ['after panel (Leek)'],
+        ])
+
     def test_panel_with_markup_inheritance(self):
         class Eggs(MarkupContainer):
             def __init__(self, id):
@@ -538,6 +634,59 @@ class PanelTestCase(AyameTestCase):
         ])
         self.assertEqual(content, [html])
 
+    def test_pager(self):
+        with self.application(self.new_environ()):
+            p = OnionPage()
+            status, headers, content = p()
+        html = self.format(OnionPage, items=range(0, 5), pager=(
+            '<a>&lt;&lt;</a> '
+            '<a>&lt;</a> '
+            '<a>1</a>'
+            '<a href="http://localhost/?view=1">2</a>'
+            '<a href="http://localhost/?view=2">3</a> '
+            '<a href="http://localhost/?view=1">&gt;</a> '
+            '<a href="http://localhost/?view=4">&gt;&gt;</a>'
+        ))
+        self.assertEqual(status, http.OK.status)
+        self.assertEqual(headers, [
+            ('Content-Type', 'text/html; charset=UTF-8'),
+            ('Content-Length', str(len(html))),
+        ])
+        self.assertEqual(content, [html])
+
+        query = ('view=2&'
+                 '{path}=pager:next')
+        with self.application(self.new_environ(query=query)):
+            p = OnionPage()
+            status, headers, content = p()
+        html = self.format(OnionPage, items=range(10, 15), pager=(
+            '<a href="http://localhost/?view=0">&lt;&lt;</a> '
+            '<a href="http://localhost/?view=1">&lt;</a> '
+            '<a href="http://localhost/?view=1">2</a>'
+            '<a>3</a>'
+            '<a href="http://localhost/?view=3">4</a> '
+            '<a href="http://localhost/?view=3">&gt;</a> '
+            '<a href="http://localhost/?view=4">&gt;&gt;</a>'
+        ))
+        self.assertEqual(status, http.OK.status)
+        self.assertEqual(content, [html])
+
+        query = 'view=99'
+        with self.application(self.new_environ(query=query)):
+            p = OnionPage()
+            status, headers, content = p()
+        html = self.format(OnionPage, items=range(20, 25), pager=(
+            '<a href="http://localhost/?view=0">&lt;&lt;</a> '
+            '<a href="http://localhost/?view=3">&lt;</a> '
+            '<a href="http://localhost/?view=2">3</a>'
+            '<a href="http://localhost/?view=3">4</a>'
+            '<a>5</a> '
+            '<a>&gt;</a> '
+            '<a>&gt;&gt;</a>'
+        ))
+        self.assertEqual(status, http.OK.status)
+        self.assertEqual(content, [html])
+
     def test_render_ayame_message(self):
         with self.application(self.new_environ(accept='en')):
             p = TomatoPage()
@@ -643,3 +792,34 @@ class ShallotsPage(ayame.Page):
         self.find('form').add(form.TextField('text'))
         self.find('form:text').required = True
         self.add(panel.FeedbackPanel('panel'))
+
+
+class OnionPage(ayame.Page):
+
+    html_t = textwrap.dedent("""\
+        <?xml version="1.0"?>
+        {doctype}
+        <html xmlns="{xhtml}">
+          <head>
+            <title>OnionPage</title>
+          </head>
+          <body>
+            <ul>
+              <li>{items}</li>
+            </ul>
+            <div class="pager">{pager}</div>
+          </body>
+        </html>
+    """)
+    kwargs = {
+        'items': lambda v: ''.join(f'<span>{i}</span>' for i in v),
+    }
+
+    def __init__(self):
+        super().__init__()
+        provider = basic.ListDataProvider([str(i) for i in range(25)])
+        self.add(basic.DataView('view', provider, 5, self.populate_item))
+        self.add(panel.Pager('pager', self.find('view'), 3))
+
+    def populate_item(self, item):
+        item.add(basic.Label('item', item.model_object))
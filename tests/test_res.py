@@ -48,6 +48,7 @@ class ResTestCase(AyameTestCase):
         r = Resource(None)
         self.assertIsNone(r.path)
         self.assertIsNone(r.mtime)
+        self.assertIsNone(r.size)
         self.assertIsNone(r.open())
 
     def test_unknown_module(self):
@@ -147,6 +148,7 @@ class ResTestCase(AyameTestCase):
                     self.assertIsInstance(r, res.FileResource)
                     self.assertEqual(r.path, path)
                     self.assertEqual(r.mtime, os.path.getmtime(path))
+                    self.assertEqual(r.size, os.path.getsize(path))
                     with r.open() as fp:
                         self.assertEqual(fp.read(), 'test_res/Spam.txt from Loader')
 
@@ -157,6 +159,7 @@ class ResTestCase(AyameTestCase):
                 self.assertIsInstance(r, res.FileResource)
                 self.assertEqual(r.path, path)
                 self.assertEqual(r.mtime, os.path.getmtime(path))
+                self.assertEqual(r.size, os.path.getsize(path))
                 with r.open() as fp:
                     self.assertEqual(fp.read(), 'test_res/ham.txt from Loader')
 
@@ -182,6 +185,7 @@ class FileResourceTestCase(AyameTestCase):
                     self.assertIsInstance(r, res.FileResource)
                     self.assertEqual(r.path, path)
                     self.assertEqual(r.mtime, os.path.getmtime(path))
+                    self.assertEqual(r.size, os.path.getsize(path))
                     with r.open() as fp:
                         self.assertEqual(fp.read().strip(), 'test_res/Spam.txt')
 
@@ -207,6 +211,7 @@ class FileResourceTestCase(AyameTestCase):
                 self.assertIsInstance(r, res.FileResource)
                 self.assertEqual(r.path, path)
                 self.assertEqual(r.mtime, os.path.getmtime(path))
+                self.assertEqual(r.size, os.path.getsize(path))
                 with r.open() as fp:
                     self.assertEqual(fp.read().strip(), 'test_res/ham.txt')
 
@@ -222,6 +227,7 @@ class FileResourceTestCase(AyameTestCase):
         r = loader.load(sys.modules[__name__], '.txt')
         self.assertEqual(r.path, path)
         self.assertEqual(r.mtime, os.path.getmtime(path))
+        self.assertEqual(r.size, os.path.getsize(path))
         with r.open() as fp:
             self.assertEqual(fp.read().strip(), 'test_res/.txt')
 
@@ -271,6 +277,7 @@ class ZipFileResourceTestCase(AyameTestCase):
                         self.assertIsInstance(r, res.ZipFileResource)
                         self.assertEqual(r.path, path)
                         self.assertEqual(r.mtime, self.mtime)
+                        self.assertEqual(r.size, len(path) + 1)
                         with r.open() as fp:
                             self.assertEqual(fp.read().strip(), 'm/Spam.txt')
 
@@ -298,6 +305,7 @@ class ZipFileResourceTestCase(AyameTestCase):
                     r = loader.load(m.ham, p)
                     self.assertIsInstance(r, res.ZipFileResource)
                     self.assertEqual(r.mtime, self.mtime)
+                    self.assertEqual(r.size, len(path) + 1)
                     with r.open() as fp:
                         self.assertEqual(fp.read().strip(), 'm/ham.txt')
 
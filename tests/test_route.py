@@ -381,6 +381,135 @@ class RouteTestCase(AyameTestCase):
             ('Location', 'http://localhost/_/new'),
         ])
 
+    def test_dispatch(self):
+        map = route.Map()
+        map.connect('/', 0)
+        map.connect('/news/<year:int>', 1)
+        map.connect('/<name>/<year:int>', 2)
+        map.connect('/news/<name>', 3)
+        map.connect('/news-<id:int>', 4)
+        map.connect('/about', 5, methods=['POST'])
+        self.assertEqual(sorted(map._index.rules), ['', '/', '/about', '/news'])
+        self.assertEqual([r.object for r in map._index.get('/news')], [1, 2, 3, 4])
+        self.assertEqual([r.object for r in map._index.get('/blog')], [2, 4])
+
+        # GET /news/2009
+        router = map.bind(self.new_environ(path='/news/2009'))
+        self.assertEqual(router.match(), (1, {'year': 2009}))
+
+        # GET /news/latest
+        router = map.bind(self.new_environ(path='/news/latest'))
+        self.assertEqual(router.match(), (3, {'name': 'latest'}))
+
+        # GET /blog/2009
+        router = map.bind(self.new_environ(path='/blog/2009'))
+        self.assertEqual(router.match(), (2, {'name': 'blog', 'year': 2009}))
+
+        # GET /news-1
+        router = map.bind(self.new_environ(path='/news-1'))
+        self.assertEqual(router.match(), (4, {'id': 1}))
+
+        # GET /about/ -> NotImplemented
+        router = map.bind(self.new_environ(path='/about/'))
+        with self.assertRaises(http.NotImplemented):
+            router.match()
+
+        # GET /blog -> NotFound
+        router = map.bind(self.new_environ(path='/blog'))
+        with self.assertRaises(http.NotFound):
+            router.match()
+
+    def test_method_index(self):
+        def match(method, path):
+            return map.bind(self.new_environ(method=method, path=path)).match()
+
+        map = route.Map()
+        map.connect('/items/', 0, methods=['GET'])
+        map.connect('/items/<id:int>', 1, methods=['PUT', 'DELETE'])
+        map.connect('/items/<id:int>', 2, methods=['GET'])
+        self.assertEqual(sorted(map._methods), ['DELETE', 'GET', 'PUT'])
+        self.assertEqual([r.object for r in map._methods['GET'].get('/items')], [0, 2])
+        self.assertEqual([r.object for r in map._methods['PUT'].get('/items')], [0, 1])
+        self.assertEqual([r.object for r in map._slashes.get('/items')], [0])
+
+        self.assertEqual(match('GET', '/items/1'), (2, {'id': 1}))
+        self.assertEqual(match('PUT', '/items/1'), (1, {'id': 1}))
+        self.assertEqual(match('DELETE', '/items/1'), (1, {'id': 1}))
+        # PUT /items -> MovedPermanently
+        with self.assertRaises(http.MovedPermanently):
+            match('PUT', '/items')
+        # PUT /items/ -> NotImplemented
+        with self.assertRaises(http.NotImplemented):
+            match('PUT', '/items/')
+        # OPTIONS /items/1 -> NotImplemented
+        with self.assertRaises(http.NotImplemented):
+            match('OPTIONS', '/items/1')
+        # OPTIONS /items/a -> NotFound
+        with self.assertRaises(http.NotFound):
+            match('OPTIONS', '/items/a')
+
+    def test_cache(self):
+        def match(path, method='GET'):
+            return map.bind(self.new_environ(method=method, path=path)).match()
+
+        map = route.Map()
+        self.assertEqual(map.cache_info(), (0, 0, 0, 0))
+        map.connect('/<year:int>', 0)
+        self.assertEqual(match('/2009'), (0, {'year': 2009}))
+        self.assertEqual(map.cache_info(), (0, 0, 0, 0))
+
+        map = route.Map(cache=2)
+        map.connect('/<year:int>', 0)
+        map.connect('/news/', 1, methods=['POST'])
+        # match
+        values = match('/2009')[1]
+        self.assertEqual(values, {'year': 2009})
+        values['year'] = 2010
+        self.assertEqual(match('/2009'), (0, {'year': 2009}))
+        self.assertEqual(map.cache_info(), (1, 1, 2, 1))
+        # MovedPermanently
+        for _ in range(2):
+            with self.assertRaises(http.MovedPermanently):
+                match('/news', 'POST')
+        self.assertEqual(map.cache_info(), (2, 2, 2, 2))
+        # NotImplemented
+        for _ in range(2):
+            with self.assertRaises(http.NotImplemented):
+                match('/news/')
+        self.assertEqual(map.cache_info(), (3, 3, 2, 2))
+        # NotFound
+        for _ in range(2):
+            with self.assertRaises(http.NotFound):
+                match('/spam')
+        self.assertEqual(map.cache_info(), (4, 4, 2, 2))
+        # clear
+        map.mount('/_').connect('/spam', 2)
+        self.assertEqual(map.cache_info(), (0, 0, 2, 0))
+        self.assertEqual(match('/_/spam'), (2, {}))
+
+    def test_build_cache(self):
+        map = route.Map()
+        map.connect('/<year:int>/<name>', 0)
+        map.connect('/<year:int>', 0, methods=['GET'])
+        map.connect('/', 0)
+        router = map.bind(self.new_environ(path='/'))
+
+        self.assertEqual(router.build(0), '/')
+        self.assertEqual(router.build(0, {'year': 2009}), '/2009')
+        self.assertEqual(router.build(0, {'year': [2009, 2010]}), '/2009?year=2010')
+        self.assertEqual(router.build(0, {'year': 'a'}), '/?year=a')
+        self.assertEqual(router.build(0, {'year': 2009, 'name': 'a'}), '/2009/a')
+        self.assertEqual(router.build(0, {'year': 2009}, method='POST'), '/?year=2009')
+        self.assertEqual(len(map._builders), 4)
+        self.assertEqual([r.path for r in map._builders[(0, frozenset(['year']), None)]],
+                         ['/<year:int>', '/'])
+
+        with self.assertRaises(ayame.RouteError):
+            router.build(1)
+        map.connect('/<name>', 1)
+        self.assertEqual(len(map._builders), 0)
+        self.assertEqual(router.build(1, {'name': 'a'}), '/a')
+
     def test_parse_args(self):
         rule = route.Rule('/', 1)
         self.assertEqual(rule._parse_args(''), ((), {}))
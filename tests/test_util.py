@@ -10,6 +10,7 @@ import collections.abc
 import os
 import pickle
 import random
+import tempfile
 import threading
 import time
 
@@ -364,6 +365,105 @@ class LRUCacheTestCase(AyameTestCase):
         self.assertEqual(c.evicted, [])
 
 
+class PersistentLRUCacheTestCase(AyameTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory(prefix='ayame-')
+        self.path = os.path.join(self.tmp.name, 'cache')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_persistent_lru_cache(self):
+        c = util.PersistentLRUCache(self.path, 2)
+        self.assertTrue(os.path.isdir(self.path))
+        self.assertEqual(c.cap, 2)
+        self.assertEqual(len(c), 0)
+        self.assertIsInstance(c, collections.abc.MutableMapping)
+
+        c['a'] = (1, 'a')
+        c['b'] = (2, 'b')
+        c['c'] = (3, 'c')
+        self.assertEqual(list(c.items()), [('c', (3, 'c')), ('b', (2, 'b'))])
+        self.assertEqual(len(os.listdir(self.path)), 2)
+        # evicted
+        self.assertNotIn('a', c)
+        self.assertIsNone(c.get('a'))
+        self.assertEqual(c['b'], (2, 'b'))
+        self.assertEqual(list(c), ['b', 'c'])
+        # new process
+        c = util.PersistentLRUCache(self.path, 2)
+        self.assertEqual(len(c), 0)
+        self.assertEqual(c.get('b'), (2, 'b'))
+        self.assertEqual(c.get('d'), None)
+        self.assertEqual(list(c), ['b'])
+
+    def test_delete(self):
+        c = util.PersistentLRUCache(self.path)
+        c['a'] = 1
+        c['b'] = 2
+        c['c'] = 3
+        del c['a']
+        self.assertNotIn('a', c)
+        with self.assertRaises(KeyError):
+            del c['a']
+        self.assertEqual(c.pop('b'), 2)
+        self.assertNotIn('b', c)
+        self.assertEqual(c.pop('b', None), None)
+        with self.assertRaises(KeyError):
+            c.pop('b')
+        c.clear()
+        self.assertNotIn('c', c)
+        self.assertEqual(os.listdir(self.path), [])
+        # not in memory
+        c['a'] = 1
+        c = util.PersistentLRUCache(self.path)
+        del c['a']
+        self.assertNotIn('a', c)
+        # evicted or not loaded
+        c = util.PersistentLRUCache(self.path, 1)
+        c['a'] = 1
+        c['b'] = 2
+        util.PersistentLRUCache(self.path)['c'] = 3
+        c.clear()
+        for k in 'abc':
+            self.assertNotIn(k, c)
+            self.assertIsNone(c.get(k))
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_broken(self):
+        c = util.PersistentLRUCache(self.path)
+        c['a'] = 1
+        c['b'] = lambda: None
+        self.assertEqual(len(os.listdir(self.path)), 1)
+
+        for n in os.listdir(self.path):
+            with open(os.path.join(self.path, n), 'wb') as fp:
+                fp.write(b'broken')
+        c = util.PersistentLRUCache(self.path)
+        with self.assertRaises(KeyError):
+            c['a']
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_copy(self):
+        self._test_dup(lambda c: c.copy())
+
+    def test_pickle(self):
+        self._test_dup(lambda c: pickle.loads(pickle.dumps(c)))
+
+    def _test_dup(self, dup):
+        r = util.PersistentLRUCache(self.path, 3)
+        for i in range(3):
+            r[chr(ord('a') + i)] = i + 1
+        c = dup(r)
+        self.assertIsNot(c, r)
+        self.assertEqual(c.cap, 3)
+        self.assertEqual(list(c.items()), [('c', 3), ('b', 2), ('a', 1)])
+        # shared directory
+        del c['a']
+        self.assertNotIn('a', util.PersistentLRUCache(self.path))
+
+
 class LRUCache(util.LRUCache):
 
     def on_init(self):